@@ -1,23 +1,42 @@
 """FastAPI application implementing inventory control for a 3D printing service."""
 from __future__ import annotations
 
+import hashlib
 import mimetypes
 import os
 import secrets
+import time
 from datetime import datetime
+from decimal import ROUND_HALF_EVEN, Decimal
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-from fastapi import Depends, FastAPI, Form, HTTPException, Request, status
+import orjson
+from anyio import to_thread
+
+from fastapi import Depends, FastAPI, Form, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import noload, raiseload
 from sqlmodel import Session, select
 from starlette.middleware.sessions import SessionMiddleware
 
-from .db import get_session, init_db
+from .cache import (
+    HARDWARE_LIST_KEY,
+    INVENTORY_LIST_KEY,
+    MATERIAL_SNAPSHOT_TTL_SECONDS,
+    MATERIALS_LIST_KEY,
+    material_key,
+    response_cache,
+)
+from .db import ensure_runtime_schema, get_session
 from .orderworks import (
+    ORDERWORKS_EAGER_LOGIN,
     OrderWorksAuthenticationError,
     OrderWorksDatabaseUnavailableError,
     OrderWorksIntegrationError,
@@ -41,7 +60,6 @@ from .models import (
     MaterialCreate,
     MaterialRead,
     MaterialUpdate,
-    PricingBreakdown,
     PricingRequest,
     PricingResponse,
     StockMovement,
@@ -54,7 +72,15 @@ STATIC_DIR = BASE_DIR / "static"
 PUBLIC_DIR = BASE_DIR.parent / "public"
 MANIFEST_FILE = STATIC_DIR / "site.webmanifest"
 SERVICE_WORKER_FILE = STATIC_DIR / "sw.js"
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+# Templates ship with the image, so skip per-render mtime checks and keep compiled bytecode on disk.
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader(str(BASE_DIR / "templates")),
+        autoescape=select_autoescape(),
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+)
 
 mimetypes.add_type("application/manifest+json", ".webmanifest")
 
@@ -62,11 +88,12 @@ ADMIN_USERNAME = os.environ.get("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "changeme")
 SECRET_KEY = os.environ.get("SECRET_KEY", "please-change-me")
 SESSION_COOKIE = "stockworks-session"
+SESSION_TTL_SECONDS = int(os.environ.get("STOCKWORKS_SESSION_TTL", 60 * 60 * 12))
 
 if not SECRET_KEY:
     raise RuntimeError("SECRET_KEY must be configured via SECRET_KEY environment variable.")
 
-app = FastAPI(title="StockWorks", version="1.0.0")
+app = FastAPI(title="StockWorks", version="1.0.0", default_response_class=ORJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -78,6 +105,7 @@ app.add_middleware(
     SessionMiddleware,
     secret_key=SECRET_KEY,
     session_cookie=SESSION_COOKIE,
+    max_age=SESSION_TTL_SECONDS,
     same_site="lax",
 )
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
@@ -89,21 +117,150 @@ def _static_file_response(path: Path, media_type: str) -> FileResponse:
     return FileResponse(path, media_type=media_type)
 
 
+# Clients may keep list payloads but must revalidate them: the UI re-reads lists right after
+# saving, so a max-age would show stale rows. Unchanged data costs a bodiless 304.
+JSON_CACHE_CONTROL = "private, no-cache"
+
+
+def _json_etag(payload: bytes) -> str:
+    # Only stable across processes and replicas when the rows keep a fixed key order (_read_row).
+    return f'"{hashlib.sha1(payload, usedforsecurity=False).hexdigest()}"'
+
+
+def _conditional_json_response(
+    request: Request,
+    payload: bytes,
+    etag: str,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    headers = {"ETag": etag, "Cache-Control": JSON_CACHE_CONTROL, **(extra_headers or {})}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def _json_list_response(
+    request: Request,
+    rows: Sequence[Dict[str, Any]],
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    payload = orjson.dumps(rows)
+    return _conditional_json_response(request, payload, _json_etag(payload), extra_headers)
+
+
+def _cached_json_response(request: Request, key: str, load: Callable[[], Sequence[Dict[str, Any]]]) -> Response:
+    """Serve a list endpoint from the response cache, running ``load`` only on a miss.
+
+    Rows come straight from the database, so they are dumped with orjson instead of
+    being re-validated against the endpoint's ``response_model``. The ETag is cached
+    with the body, so a matching conditional request is answered without touching either.
+    """
+    cached = response_cache.get(key)
+    if cached is None:
+        payload = orjson.dumps(load())
+        cached = (payload, _json_etag(payload))
+        response_cache.set(key, cached)
+    payload, etag = cached
+    return _conditional_json_response(request, payload, etag)
+
+
+# List endpoints stream ORM rows in batches so only one batch of objects is alive at a time.
+LIST_YIELD_PER = 1000
+# List queries name every relationship they serialize; with this on, touching any other one
+# raises instead of quietly issuing a query per row. Set to 0 to fall back to lazy loading.
+RAISE_ON_LAZY_LOAD = os.environ.get("STOCKWORKS_RAISE_ON_LAZY_LOAD", "1") == "1"
+MOVEMENT_PAGE_MAX = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _list_load_options(*eager: Any) -> Tuple[Any, ...]:
+    """Loader options for a list query: the given eager loads, plus raiseload for everything else."""
+    if RAISE_ON_LAZY_LOAD:
+        return (*eager, raiseload("*"))
+    return eager
+
+
+def _movement_page(
+    session: Session,
+    model: Any,
+    owner_filter: Any,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Return movement rows newest first, optionally one keyset page at a time.
+
+    The cursor is the ``created_at`` and ``id`` of the last row already delivered, so a page
+    is an index range scan no matter how deep into the history it starts. Without ``limit``
+    the full history is returned, as before.
+    """
+    statement = select(model).where(owner_filter).options(*_list_load_options())
+    if cursor:
+        created_at, movement_id = _parse_movement_cursor(cursor)
+        statement = statement.where(
+            or_(model.created_at < created_at, and_(model.created_at == created_at, model.id < movement_id))
+        )
+    statement = statement.order_by(model.created_at.desc(), model.id.desc())
+    if limit:
+        statement = statement.limit(limit + 1)
+    movements = session.exec(statement).all()
+    headers: Dict[str, str] = {}
+    if limit and len(movements) > limit:
+        movements = movements[:limit]
+        last = movements[-1]
+        headers[NEXT_CURSOR_HEADER] = f"{last.created_at.isoformat()}_{last.id}"
+    return [_read_row(movement) for movement in movements], headers
+
+
+def _parse_movement_cursor(cursor: str) -> Tuple[datetime, int]:
+    created_at, _, movement_id = cursor.rpartition("_")
+    try:
+        return datetime.fromisoformat(created_at), int(movement_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Rows are dumped in their *Read model's field order, not with model_dump(): a table instance's
+# attribute order follows how it was loaded and differs between processes, which would change
+# the JSON (and its ETag) for the same data. The embedded material is added by the caller.
+_READ_FIELDS: Dict[type, Tuple[str, ...]] = {
+    Material: tuple(MaterialRead.model_fields),
+    InventoryItem: tuple(name for name in InventoryItemRead.model_fields if name != "material"),
+    StockMovement: tuple(StockMovementRead.model_fields),
+    HardwareItem: tuple(HardwareItemRead.model_fields),
+    HardwareMovement: tuple(HardwareMovementRead.model_fields),
+}
+
+
+def _read_row(obj: Any) -> Dict[str, Any]:
+    return {name: getattr(obj, name) for name in _READ_FIELDS[type(obj)]}
+
+
+# Read endpoints return these rows directly (like the cached lists do) instead of letting FastAPI
+# re-validate each ORM object against its *Read model; response_model still documents the shape.
+def _inventory_item_row(item: InventoryItem) -> Dict[str, Any]:
+    row = _read_row(item)
+    row["material"] = _read_row(item.material) if item.material else None
+    return row
+
+
 @app.get("/sw.js", include_in_schema=False)
 @app.get("/service-worker.js", include_in_schema=False)
-def service_worker() -> FileResponse:
+async def service_worker() -> FileResponse:
     """Serve the PWA service worker at the root scope."""
     return _static_file_response(SERVICE_WORKER_FILE, media_type="application/javascript")
 
 
 @app.get("/manifest.webmanifest", include_in_schema=False)
-def web_manifest() -> FileResponse:
+async def web_manifest() -> FileResponse:
     """Expose the web manifest at the root for install prompts."""
     return _static_file_response(MANIFEST_FILE, media_type="application/manifest+json")
 
 
 @app.get("/public/{asset_path:path}", include_in_schema=False)
-def public_assets(asset_path: str) -> FileResponse:
+async def public_assets(asset_path: str) -> FileResponse:
     """Serve files from the repository-level public directory, even when not mounted."""
     target = PUBLIC_DIR / asset_path
     if not target.is_file():
@@ -114,11 +271,33 @@ def public_assets(asset_path: str) -> FileResponse:
 
 @app.on_event("startup")
 def on_startup() -> None:
-    init_db()
+    ensure_runtime_schema()
+
+
+@app.on_event("startup")
+async def configure_threadpool() -> None:
+    """Size the worker threadpool that runs the synchronous, database-backed endpoints."""
+    threadpool_size = os.environ.get("STOCKWORKS_THREADPOOL_SIZE")
+    if threadpool_size:
+        to_thread.current_default_thread_limiter().total_tokens = int(threadpool_size)
+
+
+@app.on_event("startup")
+async def warm_orderworks_client() -> None:
+    # Runs in the background, so an unreachable OrderWorks never holds up startup.
+    if ORDERWORKS_EAGER_LOGIN:
+        get_orderworks_client().start_login()
+
+
+@app.on_event("shutdown")
+async def close_orderworks_client() -> None:
+    await get_orderworks_client().aclose()
 
 
 def _is_authenticated(request: Request) -> bool:
-    return bool(request.session.get("authenticated"))
+    # The signed cookie carries its own expiry, so no per-request credential or store lookup is needed.
+    session = request.session
+    return bool(session.get("authenticated")) and session.get("expires_at", 0) > time.time()
 
 
 def require_auth(request: Request) -> bool:
@@ -132,7 +311,7 @@ def _credentials_valid(username: str, password: str) -> bool:
 
 
 @app.get("/", response_class=HTMLResponse)
-def root(request: Request):
+async def root(request: Request):
     """Serve the HTML shell for the single-page UI."""
     if not _is_authenticated(request):
         return RedirectResponse("/login", status_code=status.HTTP_302_FOUND)
@@ -140,7 +319,7 @@ def root(request: Request):
 
 
 @app.get("/login", response_class=HTMLResponse)
-def login_page(request: Request):
+async def login_page(request: Request):
     if _is_authenticated(request):
         return RedirectResponse("/", status_code=status.HTTP_303_SEE_OTHER)
     return templates.TemplateResponse("login.html", {"request": request, "error": None, "username": ""})
@@ -151,13 +330,14 @@ async def login(request: Request, username: str = Form(...), password: str = For
     if _credentials_valid(username, password):
         request.session["authenticated"] = True
         request.session["username"] = ADMIN_USERNAME
+        request.session["expires_at"] = int(time.time()) + SESSION_TTL_SECONDS
         return RedirectResponse("/", status_code=status.HTTP_303_SEE_OTHER)
     context = {"request": request, "error": "Invalid username or password.", "username": username}
     return templates.TemplateResponse("login.html", context, status_code=status.HTTP_401_UNAUTHORIZED)
 
 
 @app.post("/logout")
-def logout(request: Request):
+async def logout(request: Request):
     request.session.clear()
     return RedirectResponse("/login", status_code=status.HTTP_303_SEE_OTHER)
 
@@ -172,14 +352,22 @@ def create_material(
     material = Material.from_orm(payload)
     session.add(material)
     session.commit()
-    session.refresh(material)
+    response_cache.delete(MATERIALS_LIST_KEY)
     return material
 
 
 @app.get("/materials", response_model=List[MaterialRead])
-def list_materials(session: Session = Depends(get_session), _: bool = Depends(require_auth)):
-    materials = session.exec(select(Material).order_by(Material.name)).all()
-    return materials
+def list_materials(request: Request, session: Session = Depends(get_session), _: bool = Depends(require_auth)):
+    def load() -> List[Dict[str, Any]]:
+        statement = (
+            select(Material)
+            .options(*_list_load_options())
+            .order_by(Material.name)
+            .execution_options(yield_per=LIST_YIELD_PER)
+        )
+        return [_read_row(material) for material in session.exec(statement)]
+
+    return _cached_json_response(request, MATERIALS_LIST_KEY, load)
 
 
 @app.get("/materials/{material_id}", response_model=MaterialRead)
@@ -187,7 +375,7 @@ def get_material(material_id: int, session: Session = Depends(get_session), _: b
     material = session.get(Material, material_id)
     if not material:
         raise HTTPException(status_code=404, detail="Material not found")
-    return material
+    return ORJSONResponse(_read_row(material))
 
 
 @app.put("/materials/{material_id}", response_model=MaterialRead)
@@ -205,7 +393,7 @@ def update_material(
         setattr(material, key, value)
     session.add(material)
     session.commit()
-    session.refresh(material)
+    response_cache.delete(MATERIALS_LIST_KEY, INVENTORY_LIST_KEY, material_key(material_id))
     return material
 
 
@@ -216,6 +404,7 @@ def delete_material(material_id: int, session: Session = Depends(get_session), _
         raise HTTPException(status_code=404, detail="Material not found")
     session.delete(material)
     session.commit()
+    response_cache.delete(MATERIALS_LIST_KEY, INVENTORY_LIST_KEY, material_key(material_id))
     return None
 
 
@@ -230,14 +419,38 @@ def create_inventory_item(
     inventory_item = InventoryItem.from_orm(payload)
     session.add(inventory_item)
     session.commit()
-    session.refresh(inventory_item)
+    response_cache.delete(INVENTORY_LIST_KEY)
     return inventory_item
 
 
 @app.get("/inventory", response_model=List[InventoryItemRead])
-def list_inventory_items(session: Session = Depends(get_session), _: bool = Depends(require_auth)):
-    items = session.exec(select(InventoryItem)).all()
-    return items
+def list_inventory_items(request: Request, session: Session = Depends(get_session), _: bool = Depends(require_auth)):
+    def load() -> List[Dict[str, Any]]:
+        statement = (
+            select(InventoryItem)
+            # The materials are batch-fetched below, so the relationship's own selectin load is
+            # switched off even when lazy loads are allowed.
+            .options(*_list_load_options(noload(InventoryItem.material)))
+            .order_by(InventoryItem.id)
+            .execution_options(yield_per=LIST_YIELD_PER)
+        )
+        rows = [_read_row(item) for item in session.exec(statement)]
+        # Many spools share a material: fetch each distinct one in a single IN query and dump it
+        # once, so items of the same material embed the same snapshot.
+        material_ids = {row["material_id"] for row in rows}
+        materials: Dict[int, Dict[str, Any]] = {}
+        if material_ids:
+            materials = {
+                material.id: _read_row(material)
+                for material in session.exec(
+                    select(Material).where(Material.id.in_(material_ids)).options(*_list_load_options())
+                )
+            }
+        for row in rows:
+            row["material"] = materials.get(row["material_id"])
+        return rows
+
+    return _cached_json_response(request, INVENTORY_LIST_KEY, load)
 
 
 @app.get("/inventory/{item_id}", response_model=InventoryItemRead)
@@ -245,7 +458,7 @@ def get_inventory_item(item_id: int, session: Session = Depends(get_session), _:
     item = session.get(InventoryItem, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
-    return item
+    return ORJSONResponse(_inventory_item_row(item))
 
 
 @app.put("/inventory/{item_id}", response_model=InventoryItemRead)
@@ -265,7 +478,11 @@ def update_inventory_item(
         setattr(item, key, value)
     session.add(item)
     session.commit()
-    session.refresh(item)
+    if "material_id" in update_data:
+        # session.get loaded the old material eagerly and commits do not expire it, so reload
+        # the relationship to match the new material_id.
+        session.refresh(item, ["material"])
+    response_cache.delete(INVENTORY_LIST_KEY)
     return item
 
 
@@ -276,6 +493,7 @@ def delete_inventory_item(item_id: int, session: Session = Depends(get_session),
         raise HTTPException(status_code=404, detail="Inventory item not found")
     session.delete(item)
     session.commit()
+    response_cache.delete(INVENTORY_LIST_KEY)
     return None
 
 
@@ -286,31 +504,41 @@ def create_stock_movement(
     session: Session = Depends(get_session),
     _: bool = Depends(require_auth),
 ):
-    item = session.get(InventoryItem, payload.inventory_item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Inventory item not found")
-
-    new_qty = item.quantity_grams + payload.change_grams
-    if new_qty < 0:
+    # Apply the delta in the database so concurrent movements cannot overwrite each other.
+    new_quantity = InventoryItem.quantity_grams + payload.change_grams
+    result = session.exec(
+        update(InventoryItem)
+        .where(InventoryItem.id == payload.inventory_item_id, new_quantity >= 0)
+        .values(quantity_grams=new_quantity)
+    )
+    if result.rowcount == 0:
+        session.rollback()
+        _ensure_inventory_exists(session, payload.inventory_item_id)
         raise HTTPException(status_code=400, detail="Stock level cannot be negative")
 
     movement = StockMovement.from_orm(payload)
-    item.quantity_grams = new_qty
     session.add(movement)
-    session.add(item)
+    # The flush returns the new primary key with the INSERT and every other column is set
+    # client-side, so the row is dumped before commit instead of re-selected after it.
+    session.flush()
+    row = _read_row(movement)
     session.commit()
-    session.refresh(movement)
-    return movement
+    response_cache.delete(INVENTORY_LIST_KEY)
+    return ORJSONResponse(row, status_code=status.HTTP_201_CREATED)
 
 
 @app.get("/inventory/{item_id}/movements", response_model=List[StockMovementRead])
-def list_movements(item_id: int, session: Session = Depends(get_session), _: bool = Depends(require_auth)):
+def list_movements(
+    item_id: int,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MOVEMENT_PAGE_MAX),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+    _: bool = Depends(require_auth),
+):
     _ensure_inventory_exists(session, item_id)
-    statement = select(StockMovement).where(StockMovement.inventory_item_id == item_id).order_by(
-        StockMovement.created_at.desc()
-    )
-    movements = session.exec(statement).all()
-    return movements
+    rows, headers = _movement_page(session, StockMovement, StockMovement.inventory_item_id == item_id, limit, cursor)
+    return _json_list_response(request, rows, headers)
 
 
 # Hardware endpoints
@@ -323,14 +551,22 @@ def create_hardware_item(
     item = HardwareItem.from_orm(payload)
     session.add(item)
     session.commit()
-    session.refresh(item)
+    response_cache.delete(HARDWARE_LIST_KEY)
     return item
 
 
 @app.get("/hardware", response_model=List[HardwareItemRead])
-def list_hardware_items(session: Session = Depends(get_session), _: bool = Depends(require_auth)):
-    statement = select(HardwareItem).order_by(HardwareItem.name)
-    return session.exec(statement).all()
+def list_hardware_items(request: Request, session: Session = Depends(get_session), _: bool = Depends(require_auth)):
+    def load() -> List[Dict[str, Any]]:
+        statement = (
+            select(HardwareItem)
+            .options(*_list_load_options())
+            .order_by(HardwareItem.name)
+            .execution_options(yield_per=LIST_YIELD_PER)
+        )
+        return [_read_row(item) for item in session.exec(statement)]
+
+    return _cached_json_response(request, HARDWARE_LIST_KEY, load)
 
 
 @app.get("/hardware/{hardware_id}", response_model=HardwareItemRead)
@@ -338,7 +574,7 @@ def get_hardware_item(hardware_id: int, session: Session = Depends(get_session),
     item = session.get(HardwareItem, hardware_id)
     if not item:
         raise HTTPException(status_code=404, detail="Hardware item not found")
-    return item
+    return ORJSONResponse(_read_row(item))
 
 
 @app.put("/hardware/{hardware_id}", response_model=HardwareItemRead)
@@ -356,7 +592,7 @@ def update_hardware_item(
         setattr(item, key, value)
     session.add(item)
     session.commit()
-    session.refresh(item)
+    response_cache.delete(HARDWARE_LIST_KEY)
     return item
 
 
@@ -367,6 +603,7 @@ def delete_hardware_item(hardware_id: int, session: Session = Depends(get_sessio
         raise HTTPException(status_code=404, detail="Hardware item not found")
     session.delete(item)
     session.commit()
+    response_cache.delete(HARDWARE_LIST_KEY)
     return None
 
 
@@ -376,28 +613,38 @@ def create_hardware_movement(
     session: Session = Depends(get_session),
     _: bool = Depends(require_auth),
 ):
-    item = session.get(HardwareItem, payload.hardware_item_id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Hardware item not found")
-    new_qty = item.quantity_on_hand + payload.change_units
-    if new_qty < 0:
+    new_quantity = HardwareItem.quantity_on_hand + payload.change_units
+    result = session.exec(
+        update(HardwareItem)
+        .where(HardwareItem.id == payload.hardware_item_id, new_quantity >= 0)
+        .values(quantity_on_hand=new_quantity)
+    )
+    if result.rowcount == 0:
+        session.rollback()
+        _ensure_hardware_exists(session, payload.hardware_item_id)
         raise HTTPException(status_code=400, detail="Stock level cannot be negative")
     movement = HardwareMovement.from_orm(payload)
-    item.quantity_on_hand = new_qty
-    session.add(item)
     session.add(movement)
+    session.flush()
+    row = _read_row(movement)
     session.commit()
-    session.refresh(movement)
-    return movement
+    response_cache.delete(HARDWARE_LIST_KEY)
+    return ORJSONResponse(row, status_code=status.HTTP_201_CREATED)
 
 
 @app.get("/hardware/{hardware_id}/movements", response_model=List[HardwareMovementRead])
-def list_hardware_movements(hardware_id: int, session: Session = Depends(get_session), _: bool = Depends(require_auth)):
+def list_hardware_movements(
+    hardware_id: int,
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MOVEMENT_PAGE_MAX),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+    _: bool = Depends(require_auth),
+):
     _ensure_hardware_exists(session, hardware_id)
-    statement = select(HardwareMovement).where(HardwareMovement.hardware_item_id == hardware_id).order_by(
-        HardwareMovement.created_at.desc()
-    )
-    return session.exec(statement).all()
+    owner_filter = HardwareMovement.hardware_item_id == hardware_id
+    rows, headers = _movement_page(session, HardwareMovement, owner_filter, limit, cursor)
+    return _json_list_response(request, rows, headers)
 
 
 # Pricing endpoint
@@ -407,36 +654,37 @@ def calculate_quote(
     session: Session = Depends(get_session),
     _: bool = Depends(require_auth),
 ):
-    material = session.get(Material, payload.material_id)
+    material = get_material_cached(session, payload.material_id)
     if not material:
         raise HTTPException(status_code=404, detail="Material not found for quote")
 
-    material_cost = payload.weight_grams * material.price_per_gram
+    material_cost = payload.weight_grams * material["price_per_gram"]
     machine_cost = payload.print_time_hours * payload.machine_hour_rate
     subtotal = material_cost + machine_cost + payload.labor_cost
     margin_amount = subtotal * (payload.margin_pct / 100)
     total_price = subtotal + margin_amount
 
-    breakdown = PricingBreakdown(
-        material_cost=round(material_cost, 2),
-        machine_cost=round(machine_cost, 2),
-        labor_cost=round(payload.labor_cost, 2),
-        subtotal=round(subtotal, 2),
-        margin_amount=round(margin_amount, 2),
-        total_price=round(total_price, 2),
+    breakdown = dict(
+        zip(
+            PRICING_FIELDS,
+            _round_currency(material_cost, machine_cost, payload.labor_cost, subtotal, margin_amount, total_price),
+        )
     )
 
-    return PricingResponse(pricing=breakdown, material_snapshot=MaterialRead.from_orm(material))
+    # Both parts are plain data already shaped like PricingResponse, so skip re-validation.
+    return ORJSONResponse({"pricing": breakdown, "material_snapshot": material})
 
 
 @app.get("/orderworks/jobs")
-def fetch_orderworks_jobs(
+async def fetch_orderworks_jobs(
     _: bool = Depends(require_auth),
     session: Session = Depends(get_session),
 ):
     base_url_override = os.environ.get("ORDERWORKS_BASE_URL", "")
     try:
-        jobs = list_orderworks_jobs_via_database(session)
+        # The database read is blocking, so it runs on the threadpool; the HTTP fallback below
+        # is awaited on the event loop and holds no thread while OrderWorks responds.
+        jobs = await to_thread.run_sync(list_orderworks_jobs_via_database, session)
     except OrderWorksDatabaseUnavailableError as db_error:
         client = get_orderworks_client()
         if not client.is_configured:
@@ -445,7 +693,7 @@ def fetch_orderworks_jobs(
                 detail=f"{db_error}. Provide ORDERWORKS_* credentials for HTTP fallback or verify DATABASE_URL.",
             )
         try:
-            jobs = client.list_jobs()
+            jobs = await client.list_jobs()
         except OrderWorksNotConfiguredError:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -455,25 +703,66 @@ def fetch_orderworks_jobs(
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
         except OrderWorksIntegrationError as exc:
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc))
-        return {"jobs": jobs, "base_url": client.base_url}
-    return {"jobs": jobs, "base_url": base_url_override}
+        return _orderworks_jobs_response(jobs, client.base_url)
+    return _orderworks_jobs_response(jobs, base_url_override)
+
+
+def _orderworks_jobs_response(jobs: List[Any], base_url: str) -> Response:
+    # Dumped by orjson as is rather than walked by jsonable_encoder first; only values orjson
+    # has no native encoding for (such as Decimal columns) fall back to jsonable_encoder.
+    payload = orjson.dumps({"jobs": jobs, "base_url": base_url}, default=jsonable_encoder)
+    return Response(content=payload, media_type="application/json")
+
+
+# Load balancers probe several times per second; rebuild the body at most once a second.
+_HEALTH_CACHE: Dict[str, Any] = {"generated_at": float("-inf"), "body": b""}
+
+
+@app.get("/health", tags=["system"], response_model=Dict[str, str])
+async def healthcheck() -> Response:
+    now = time.monotonic()
+    if now - _HEALTH_CACHE["generated_at"] >= 1.0:
+        _HEALTH_CACHE["body"] = orjson.dumps({"status": "ok", "timestamp": datetime.utcnow().isoformat()})
+        _HEALTH_CACHE["generated_at"] = now
+    return Response(content=_HEALTH_CACHE["body"], media_type="application/json")
+
+
+PRICING_FIELDS = ("material_cost", "machine_cost", "labor_cost", "subtotal", "margin_amount", "total_price")
+CENT = Decimal("0.01")
+
+
+def _round_currency(*amounts: float) -> Tuple[float, ...]:
+    """Quantize amounts to cents from their shortest decimal form, so 2.675 rounds like it reads."""
+    return tuple(float(Decimal(str(amount)).quantize(CENT, rounding=ROUND_HALF_EVEN)) for amount in amounts)
+
 
+def get_material_cached(session: Session, material_id: int) -> Optional[Dict[str, Any]]:
+    """Return a material snapshot (MaterialRead fields), consulting the cache before the database.
 
-@app.get("/health", tags=["system"])
-def healthcheck() -> dict[str, str]:
-    return {"status": "ok", "timestamp": datetime.utcnow().isoformat()}
+    The dict is shared between requests and must not be mutated.
+    """
+    key = material_key(material_id)
+    snapshot = response_cache.get(key)
+    if snapshot is None:
+        material = session.get(Material, material_id)
+        if not material:
+            return None
+        snapshot = _read_row(material)
+        response_cache.set(key, snapshot, ttl=MATERIAL_SNAPSHOT_TTL_SECONDS)
+    return snapshot
 
 
+# Existence checks select only the primary key so no row is fetched or hydrated.
 def _ensure_material_exists(session: Session, material_id: int) -> None:
-    if not session.get(Material, material_id):
+    if session.exec(select(Material.id).where(Material.id == material_id)).first() is None:
         raise HTTPException(status_code=404, detail="Material not found")
 
 
 def _ensure_inventory_exists(session: Session, item_id: int) -> None:
-    if not session.get(InventoryItem, item_id):
+    if session.exec(select(InventoryItem.id).where(InventoryItem.id == item_id)).first() is None:
         raise HTTPException(status_code=404, detail="Inventory item not found")
 
 
 def _ensure_hardware_exists(session: Session, hardware_id: int) -> None:
-    if not session.get(HardwareItem, hardware_id):
+    if session.exec(select(HardwareItem.id).where(HardwareItem.id == hardware_id)).first() is None:
         raise HTTPException(status_code=404, detail="Hardware item not found")
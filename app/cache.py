@@ -0,0 +1,66 @@
+"""In-process cache for rarely-changing StockWorks reads."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_CACHE_TTL_SECONDS = float(os.environ.get("STOCKWORKS_CACHE_TTL", "60"))
+
+MATERIALS_LIST_KEY = "materials:all:v1"
+INVENTORY_LIST_KEY = "inventory:all:v1"
+HARDWARE_LIST_KEY = "hardware:all:v1"
+MATERIAL_SNAPSHOT_TTL_SECONDS = 300.0
+
+
+def material_key(material_id: int) -> str:
+    return f"material:{material_id}"
+
+
+class TTLCache:
+    """Thread-safe key/value store whose entries expire after a fixed number of seconds.
+
+    Entries are local to the process; writers invalidate the keys they affect so the
+    TTL only bounds staleness for changes made elsewhere (for example the desktop GUI).
+    """
+
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        # A disabled cache never serves entries (see get), so it must not store them either.
+        if self.ttl <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = TTLCache()
@@ -1,110 +1,411 @@
 """Database utilities for the StockWorks inventory service."""
 from __future__ import annotations
 
+import hashlib
 import os
-from contextlib import contextmanager
-from pathlib import Path
-from typing import Iterator, Optional, Tuple
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
 
+from sqlalchemy import Column, MetaData, String, Table, event, inspect, select, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 from sqlmodel import Session, SQLModel, create_engine
-from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+from urllib.parse import unquote_plus
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
-def _resolve_data_dir() -> Path:
+def _resolve_data_dir() -> str:
     """Return the directory that stores the SQLite database."""
     configured_dir = os.environ.get("STOCKWORKS_DATA_DIR")
     if configured_dir:
-        path = Path(configured_dir)
-        if not path.is_absolute():
-            path = PROJECT_ROOT / path
-        return path
-    return PROJECT_ROOT / "data"
+        # os.path.join keeps an absolute configured_dir as-is and anchors a relative one at the project root.
+        return os.path.join(PROJECT_ROOT, configured_dir)
+    return os.path.join(PROJECT_ROOT, "data")
 
 
-DEFAULT_SQLITE_PATH = (_resolve_data_dir() / os.environ.get("STOCKWORKS_DB_FILENAME", "app.db")).resolve()
+# Plain string operations: unlike Path.resolve() this needs no filesystem access at import time.
+DEFAULT_SQLITE_PATH = os.path.normpath(
+    os.path.join(_resolve_data_dir(), os.environ.get("STOCKWORKS_DB_FILENAME", "app.db"))
+)
 
 
 def _build_database_url() -> str:
     url = os.environ.get("DATABASE_URL")
     if url:
         return url
-    DEFAULT_SQLITE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    os.makedirs(os.path.dirname(DEFAULT_SQLITE_PATH), exist_ok=True)
     return f"sqlite:///{DEFAULT_SQLITE_PATH}"
 
 
+_SCHEMA_PARAMETER_RE = re.compile(r"([?&])schema=([^&#]*)")
+
+
 def _strip_schema_parameter(database_url: str) -> Tuple[str, Optional[str]]:
-    """Remove ?schema=<name> from DATABASE_URL so psycopg2 accepts the DSN."""
-    parsed = urlparse(database_url)
-    if not parsed.query:
+    """Remove ?schema=<name> from DATABASE_URL so psycopg2 accepts the DSN.
+
+    The rest of the URL is left byte-for-byte as configured, including its percent-encoding.
+    """
+    match = _SCHEMA_PARAMETER_RE.search(database_url)
+    if match is None:
         return database_url, None
 
-    schema = None
-    filtered_query = []
-    for key, value in parse_qsl(parsed.query, keep_blank_values=True):
-        if key == "schema" and schema is None:
-            schema = value
-        else:
-            filtered_query.append((key, value))
+    schema = unquote_plus(match.group(2))
+    before, after = database_url[: match.start()], database_url[match.end() :]
+    if after.startswith("&"):
+        # Keep the separator that introduced the removed pair for the parameter that follows it.
+        return before + match.group(1) + after[1:], schema
+    return before + after, schema
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _pool_options() -> Dict[str, Any]:
+    """Connection pool settings for server databases (PostgreSQL/MySQL)."""
+    return {
+        "pool_size": _env_int("STOCKWORKS_DB_POOL_SIZE", 20),
+        "max_overflow": _env_int("STOCKWORKS_DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("STOCKWORKS_DB_POOL_TIMEOUT", 30),
+        "pool_recycle": _env_int("STOCKWORKS_DB_POOL_RECYCLE", 1800),
+        "pool_pre_ping": True,
+    }
 
-    if schema is None:
-        return database_url, None
 
-    new_query = urlencode(filtered_query, doseq=True)
-    return urlunparse(parsed._replace(query=new_query)), schema
+# Keep the SQLite file lock for the life of the connection instead of taking it per transaction.
+# Only safe when this process is the sole user of the database file.
+SQLITE_EXCLUSIVE = os.environ.get("STOCKWORKS_SQLITE_EXCLUSIVE") == "1"
 
 
-def create_db_engine():
+def _sqlite_pool_options(database_url: str) -> Dict[str, Any]:
+    """Pool settings for SQLite.
+
+    An in-memory database only exists inside the connection that created it, so every
+    thread must share that one connection. File databases keep a pool sized like the
+    server one: checked-in connections stay open, which avoids reopening the file and
+    re-running the connect pragmas whenever load exceeds SQLAlchemy's default of five.
+    In exclusive locking mode a second connection could never get at the file, so the
+    pool is limited to the one connection that holds the lock.
+    """
+    url = make_url(database_url)
+    if url.database in (None, "", ":memory:") or url.query.get("mode") == "memory":
+        return {"poolclass": StaticPool}
+    if SQLITE_EXCLUSIVE:
+        return {"pool_size": 1, "max_overflow": 0, "pool_timeout": _env_int("STOCKWORKS_DB_POOL_TIMEOUT", 30)}
+    return {
+        "pool_size": _env_int("STOCKWORKS_DB_POOL_SIZE", 20),
+        "max_overflow": _env_int("STOCKWORKS_DB_MAX_OVERFLOW", 10),
+        "pool_timeout": _env_int("STOCKWORKS_DB_POOL_TIMEOUT", 30),
+    }
+
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    *(("PRAGMA locking_mode=EXCLUSIVE",) if SQLITE_EXCLUSIVE else ()),
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+_SQLITE_INIT = "".join(f"{pragma};" for pragma in SQLITE_PRAGMAS)
+
+
+SQLITE_MMAP_MIN_BYTES = 256 * 1024 * 1024
+SQLITE_MMAP_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def _sqlite_mmap_size(database_path: Optional[str]) -> int:
+    """Memory-map the whole database file (at least 256 MiB so it can grow, at most 1 GiB)."""
+    try:
+        file_size = os.path.getsize(database_path) if database_path else 0
+    except OSError:
+        file_size = 0
+    return min(max(file_size, SQLITE_MMAP_MIN_BYTES), SQLITE_MMAP_MAX_BYTES)
+
+
+def _configure_sqlite_connection(dbapi_connection, database_path: Optional[str]) -> None:
+    """Let readers proceed during writes, avoid an fsync on every commit, and enforce foreign keys."""
+    # One executescript call runs every pragma without a prepare/step round trip per statement.
+    # mmap_size is per connection, so it is sized against the file as it is right now.
+    dbapi_connection.executescript(f"{_SQLITE_INIT}PRAGMA mmap_size={_sqlite_mmap_size(database_path)};")
+
+
+SQLITE_OPTIMIZE_INTERVAL = _env_int("STOCKWORKS_SQLITE_OPTIMIZE_INTERVAL", 1000)
+
+
+def _optimize_sqlite_connection(dbapi_connection, connection_record) -> None:
+    """Run PRAGMA optimize every SQLITE_OPTIMIZE_INTERVAL checkins to keep planner statistics fresh."""
+    if dbapi_connection is None or SQLITE_OPTIMIZE_INTERVAL <= 0:
+        return
+    checkins = connection_record.info.get("checkins", 0) + 1
+    if checkins < SQLITE_OPTIMIZE_INTERVAL:
+        connection_record.info["checkins"] = checkins
+        return
+    connection_record.info["checkins"] = 0
+    try:
+        dbapi_connection.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        # Statistics are best-effort; a busy database must not fail the checkin.
+        pass
+
+
+INSERTMANYVALUES_PAGE_SIZE = 500
+
+_CONNECT_ARGS_CACHE: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+
+def _connect_args(database_url: str, schema: Optional[str], is_sqlite: bool) -> Dict[str, Any]:
+    """Return the DBAPI connect arguments for a URL, built once per (url, schema) pair.
+
+    The returned dict is shared between engines and must not be mutated.
+    """
+    key = (database_url, schema)
+    connect_args = _CONNECT_ARGS_CACHE.get(key)
+    if connect_args is not None:
+        return connect_args
+    # detect_types stays off so pysqlite hands back raw values and SQLAlchemy's own result
+    # processors do the conversion once. Shared-cache URIs are deliberately not used: they
+    # swap WAL's reader/writer concurrency for table locks that ignore busy_timeout.
+    connect_args = {"check_same_thread": False, "detect_types": 0} if is_sqlite else {}
+    if schema and not is_sqlite:
+        connect_args["options"] = f"-c search_path={schema}"
+    _CONNECT_ARGS_CACHE[key] = connect_args
+    return connect_args
+
+
+def create_db_engine() -> Engine:
     database_url = _build_database_url()
     database_url, schema = _strip_schema_parameter(database_url)
-    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
-    if schema and not database_url.startswith("sqlite"):
-        schema_option = f"-c search_path={schema}"
-        existing_options = connect_args.get("options")
-        connect_args["options"] = f"{existing_options} {schema_option}".strip() if existing_options else schema_option
-    return create_engine(database_url, connect_args=connect_args)
+    is_sqlite = database_url.startswith("sqlite")
+    connect_args = _connect_args(database_url, schema, is_sqlite)
+    engine_options = _sqlite_pool_options(database_url) if is_sqlite else _pool_options()
+    db_engine = create_engine(
+        database_url,
+        connect_args=connect_args,
+        # Bulk ORM inserts go out as multi-row INSERT ... VALUES ... RETURNING batches.
+        use_insertmanyvalues=True,
+        insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+        **engine_options,
+    )
+    if is_sqlite:
+        database_path = make_url(database_url).database
+        event.listen(
+            db_engine,
+            "connect",
+            lambda dbapi_connection, _connection_record: _configure_sqlite_connection(dbapi_connection, database_path),
+        )
+        event.listen(db_engine, "checkin", _optimize_sqlite_connection)
+    return db_engine
+
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
 
+def get_engine() -> Engine:
+    """Return the shared engine, creating it (and the SQLite data directory) on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_db_engine()
+    return _engine
 
-engine = create_db_engine()
 
+def dispose_engine() -> None:
+    """Close pooled connections and drop the engine; the next get_engine() builds a new one."""
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
 
-def init_db() -> None:
-    """Create database tables if they don't exist yet and ensure schema patches are applied."""
-    SQLModel.metadata.create_all(engine)
+
+def __getattr__(name: str) -> Any:
+    # ``from app.db import engine`` keeps working and yields the real Engine, created on first
+    # access so DATABASE_URL and friends are only read when the database is first touched.
+    # The name is bound at import time: code that outlives dispose_engine() should call
+    # get_engine() instead.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Bookkeeping lives outside SQLModel.metadata so it is not part of the fingerprinted schema.
+_schema_state = Table(
+    "stockworks_schema_state",
+    MetaData(),
+    Column("name", String(64), primary_key=True),
+    Column("value", String(128), nullable=False),
+)
+_SCHEMA_FINGERPRINT_KEY = "schema_fingerprint"
+_POSTGRES_SCHEMA_LOCK_ID = 0x53574442  # arbitrary constant shared by every StockWorks process
+
+
+def init_db_schema() -> None:
+    """Create database tables if they don't exist yet and ensure schema patches are applied.
+
+    The compiled DDL is fingerprinted and stored after a successful run, so a restart against
+    an unchanged schema skips the per-table existence checks behind ``create_all``.
+    """
+    engine = get_engine()
+    fingerprint = _schema_fingerprint(engine)
+    if _stored_schema_fingerprint(engine) != fingerprint:
+        with engine.begin() as conn:
+            _lock_schema(conn)
+            if _stored_schema_fingerprint(conn) != fingerprint:
+                SQLModel.metadata.create_all(conn)
+                _ensure_indexes(conn)
+                _store_schema_fingerprint(conn, fingerprint)
     _ensure_material_columns()
 
 
-@contextmanager
-def session_scope() -> Iterator[Session]:
-    session = Session(engine)
-    try:
-        yield session
-        session.commit()
-    except Exception:
-        session.rollback()
-        raise
-    finally:
-        session.close()
+def ensure_runtime_schema() -> None:
+    """Prepare the schema for a serving process.
+
+    Set STOCKWORKS_RUN_MIGRATIONS=0 once the schema is created elsewhere (``python -m app.db
+    init`` or the Gunicorn master) so workers only apply the lightweight column patch.
+    """
+    if os.environ.get("STOCKWORKS_RUN_MIGRATIONS", "1") == "1":
+        init_db_schema()
+    else:
+        _ensure_material_columns()
+
+
+def _schema_fingerprint(engine: Engine) -> str:
+    statements = []
+    for table in SQLModel.metadata.sorted_tables:
+        statements.append(str(CreateTable(table).compile(dialect=engine.dialect)))
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            statements.append(str(CreateIndex(index).compile(dialect=engine.dialect)))
+    return hashlib.blake2b("\n".join(statements).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _stored_schema_fingerprint(bind) -> Optional[str]:
+    if not inspect(bind).has_table(_schema_state.name):
+        return None
+    statement = select(_schema_state.c.value).where(_schema_state.c.name == _SCHEMA_FINGERPRINT_KEY)
+    if isinstance(bind, Engine):
+        with bind.connect() as conn:
+            return conn.execute(statement).scalar()
+    return bind.execute(statement).scalar()
+
+
+def _store_schema_fingerprint(conn, fingerprint: str) -> None:
+    _schema_state.create(conn, checkfirst=True)
+    conn.execute(_schema_state.delete().where(_schema_state.c.name == _SCHEMA_FINGERPRINT_KEY))
+    conn.execute(_schema_state.insert().values(name=_SCHEMA_FINGERPRINT_KEY, value=fingerprint))
+
+
+def _lock_schema(conn) -> None:
+    """Serialize schema changes between processes starting at the same time."""
+    dialect_name = conn.dialect.name
+    if dialect_name == "sqlite":
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+    elif dialect_name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": _POSTGRES_SCHEMA_LOCK_ID})
+
+
+# Objects keep their loaded state after commit; call session.refresh(obj) when a
+# post-commit reload from the database is actually needed.
+SessionLocal = sessionmaker(class_=Session, expire_on_commit=False, autoflush=False)
+
+
+class SessionScope:
+    """Open a session that commits on success and rolls back if the block raises."""
+
+    __slots__ = ("session",)
+
+    def __enter__(self) -> Session:
+        self.session = SessionLocal(bind=get_engine())
+        return self.session
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                self.session.commit()
+            else:
+                self.session.rollback()
+        except BaseException:
+            self.session.rollback()
+            raise
+        finally:
+            self.session.close()
+
+
+session_scope = SessionScope
 
 
 def get_session() -> Iterator[Session]:
-    with Session(engine) as session:
+    with SessionLocal(bind=get_engine()) as session:
         yield session
 
 
+MATERIAL_COLUMNS_PATCH_LEVEL = 1
+
+
 def _ensure_material_columns() -> None:
     """Add newly introduced columns to the materials table for existing SQLite deployments."""
-    backend = engine.url.get_backend_name()
-    if backend != "sqlite":
+    engine = get_engine()
+    if engine.dialect.name != "sqlite":
         return
     desired_columns = {
         "category": "TEXT",
         "barcode": "TEXT",
     }
+    with engine.connect() as conn:
+        if _sqlite_user_version(conn) >= MATERIAL_COLUMNS_PATCH_LEVEL:
+            return
     with engine.begin() as conn:
-        pragma_rows = conn.exec_driver_sql("PRAGMA table_info(material)").fetchall()
-        existing_columns = {row[1] for row in pragma_rows}
-        for column, ddl in desired_columns.items():
-            if column not in existing_columns:
-                conn.exec_driver_sql(f"ALTER TABLE material ADD COLUMN {column} {ddl}")
+        # Take the write lock before re-checking so concurrently starting workers
+        # apply the patch once instead of racing into duplicate-column errors.
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+        if _sqlite_user_version(conn) >= MATERIAL_COLUMNS_PATCH_LEVEL:
+            return
+        for column in _missing_material_columns(conn, desired_columns):
+            conn.exec_driver_sql(f"ALTER TABLE material ADD COLUMN {column} {desired_columns[column]}")
+        # Recorded in the same transaction as the ALTERs, so later starts skip the column scan.
+        conn.exec_driver_sql(f"PRAGMA user_version = {MATERIAL_COLUMNS_PATCH_LEVEL}")
+
+
+def _sqlite_user_version(conn) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def _missing_material_columns(conn, desired_columns: Dict[str, str]) -> list[str]:
+    missing = set(desired_columns)
+    # Stream table_info rows and stop as soon as every desired column has been seen.
+    for row in conn.exec_driver_sql("PRAGMA table_info(material)"):
+        missing.discard(row[1])
+        if not missing:
+            break
+    return [column for column in desired_columns if column in missing]
+
+
+def _ensure_indexes(conn) -> None:
+    """Create indexes added after a table was first created; create_all only indexes new tables."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] != ["init"]:
+        raise SystemExit("usage: python -m app.db init")
+    from . import models  # noqa: F401  (registers the tables on SQLModel.metadata)
+
+    init_db_schema()
@@ -1,16 +1,158 @@
 """Tkinter-based GUI client for the StockWorks inventory system."""
 from __future__ import annotations
 
+import re
 import tkinter as tk
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from tkinter import messagebox, ttk
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
 
-from sqlmodel import select
+from sqlalchemy import and_, bindparam, or_, update
+from sqlalchemy.engine import Row
+from sqlmodel import Session, select
 
-from .db import init_db, session_scope
+from .db import SessionLocal, get_engine, init_db_schema
 from .models import InventoryItem, Material, StockMovement
 
+# Treeview rows written per event-loop turn; the first chunk (a screenful and then some)
+# is rendered immediately and the rest streams in while the UI stays responsive.
+TREE_RENDER_CHUNK = 200
+MOVEMENT_PAGE_SIZE = 200
+# How often the Tk thread checks whether a background query has finished, in milliseconds.
+DB_POLL_INTERVAL_MS = 15
+# How long a success message stays in the status bar.
+STATUS_CLEAR_MS = 3000
+# Refresh requests made within this many milliseconds are served by a single query per list.
+REFRESH_DEBOUNCE_MS = 50
+
+T = TypeVar("T")
+
+# Bound formatters for the Treeview cells, built once instead of per row.
+_UNIT_PRICE_FORMAT = "${:.4f}".format
+_GRAMS_FORMAT = "{:.2f}".format
+_CHANGE_GRAMS_FORMAT = "{:+.2f}".format
+
+# Everything float()/int() accept from a form field, so a match always converts cleanly.
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_INT_RE = re.compile(r"[+-]?\d+")
+
+
+def _parse_float(text: str, default: Optional[float] = None) -> Tuple[bool, Optional[float]]:
+    """Parse a stripped form value as ``(ok, value)``; empty input gives ``default`` and fails without one."""
+    if not text:
+        return default is not None, default
+    if _FLOAT_RE.fullmatch(text) is None:
+        return False, None
+    return True, float(text)
+
+
+def _parse_int(text: str) -> Tuple[bool, Optional[int]]:
+    if _INT_RE.fullmatch(text) is None:
+        return False, None
+    return True, int(text)
+
+
+_QUOTE_FORMAT = (
+    "Material ({}): ${:.2f}\n"
+    "Machine time: ${:.2f}\n"
+    "Labor: ${:.2f}\n"
+    "Subtotal: ${:.2f}\n"
+    "Margin: ${:.2f}\n"
+    "Total price: ${:.2f}"
+).format
+
+
+@lru_cache(maxsize=32)
+def _format_quote(
+    material_name: str,
+    price_per_gram: float,
+    weight: float,
+    hours: float,
+    machine_rate: float,
+    labor: float,
+    margin: float,
+) -> str:
+    """Render the quote summary; repeated clicks with unchanged inputs reuse the text."""
+    material_cost = weight * price_per_gram
+    machine_cost = hours * machine_rate
+    subtotal = material_cost + machine_cost + labor
+    total = subtotal * (1 + margin / 100)
+    return _QUOTE_FORMAT(material_name, material_cost, machine_cost, labor, subtotal, total - subtotal, total)
+
+
+@dataclass(slots=True)
+class MaterialRow:
+    """The material columns the GUI lists and edits, in the order _MATERIALS_STATEMENT selects them."""
+
+    id: int
+    name: str
+    filament_type: str
+    color: str
+    price_per_gram: float
+    spool_weight_grams: int
+    supplier: Optional[str]
+    brand: Optional[str]
+    notes: Optional[str]
+
+
+# List queries are built once at import and reused on every refresh; per-call values are
+# bound parameters. Only displayed columns are selected, so rows come back as plain tuples.
+_MATERIALS_STATEMENT = select(
+    Material.id,
+    Material.name,
+    Material.filament_type,
+    Material.color,
+    Material.price_per_gram,
+    Material.spool_weight_grams,
+    Material.supplier,
+    Material.brand,
+    Material.notes,
+).order_by(Material.name)
+# The material name and color come from the same query, so no per-row lookups are needed.
+_INVENTORY_STATEMENT = (
+    select(
+        InventoryItem.id,
+        InventoryItem.material_id,
+        InventoryItem.location,
+        InventoryItem.quantity_grams,
+        InventoryItem.reorder_level,
+        InventoryItem.spool_serial,
+        InventoryItem.unit_cost_override,
+        Material.name.label("material_name"),
+        Material.color.label("material_color"),
+    )
+    .join(Material, InventoryItem.material_id == Material.id, isouter=True)
+    .order_by(InventoryItem.location)
+)
+_MOVEMENT_COLUMNS = select(
+    StockMovement.id,
+    StockMovement.created_at,
+    StockMovement.movement_type,
+    StockMovement.change_grams,
+    StockMovement.reference,
+    StockMovement.note,
+).where(StockMovement.inventory_item_id == bindparam("item_id"))
+_MOVEMENT_ORDER = (StockMovement.created_at.desc(), StockMovement.id.desc())
+_MOVEMENT_FIRST_PAGE_STATEMENT = _MOVEMENT_COLUMNS.order_by(*_MOVEMENT_ORDER).limit(MOVEMENT_PAGE_SIZE + 1)
+# Keyset continuation: rows strictly older than the last one shown.
+_MOVEMENT_NEXT_PAGE_STATEMENT = (
+    _MOVEMENT_COLUMNS.where(
+        or_(
+            StockMovement.created_at < bindparam("cursor_created_at"),
+            and_(
+                StockMovement.created_at == bindparam("cursor_created_at"),
+                StockMovement.id < bindparam("cursor_id"),
+            ),
+        )
+    )
+    .order_by(*_MOVEMENT_ORDER)
+    .limit(MOVEMENT_PAGE_SIZE + 1)
+)
+
 
 class StockWorksApp(tk.Tk):
     """Desktop GUI for managing materials, inventory, and pricing."""
@@ -19,17 +161,87 @@ class StockWorksApp(tk.Tk):
         super().__init__()
         self.title("StockWorks Inventory")
         self.minsize(1100, 680)
-        init_db()
-
-        self.material_cache: Dict[int, Material] = {}
-        self.inventory_cache: Dict[int, InventoryItem] = {}
+        # Refresh queries run on a single background thread with a session of their own, so a
+        # large refresh never blocks the event loop and the two sessions are never shared.
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stockworks-db")
+        # Open the database and check the schema on that thread while the widgets are built.
+        schema_ready = self._db_executor.submit(init_db_schema)
+        # One session for the lifetime of the window; each action runs as its own
+        # transaction on it (see _session) instead of building a new Session per click.
+        self.session: Session = SessionLocal(bind=get_engine())
+        self._read_session: Session = SessionLocal(bind=get_engine())
+
+        self.material_cache: Dict[int, MaterialRow] = {}
+        self.inventory_cache: Dict[int, Row] = {}
         self.material_choice_values: List[str] = []
-
-        self.material_comboboxes: List[ttk.Combobox] = []
+        self._choice_to_id: Dict[str, int] = {}
+
+        # Each material combobox paired with the IntVar holding the id of its current choice (0 = none).
+        self.material_comboboxes: List[Tuple[ttk.Combobox, tk.IntVar]] = []
+
+        # Values last written to each Treeview row, keyed by iid, so refreshes only touch changed rows.
+        self._material_row_cache: Dict[str, Tuple[object, ...]] = {}
+        self._inventory_row_cache: Dict[str, Tuple[object, ...]] = {}
+        self._movement_row_cache: Dict[str, Tuple[object, ...]] = {}
+        # Pending ``after_idle`` job per Treeview that is still streaming rows in.
+        self._tree_jobs: Dict[str, str] = {}
+        self._status_job: Optional[str] = None
+        self._pending_refresh: Set[str] = set()
+        self._refresh_job: Optional[str] = None
+
+        # Movement history paging: rows shown so far and the keyset of the last one.
+        self._movement_item_id: Optional[int] = None
+        self._movement_rows: List[Tuple[str, Tuple[object, ...]]] = []
+        self._movement_cursor: Optional[Tuple[datetime, int]] = None
+        # Bumped whenever the history is reset so pages requested for a previous item are dropped.
+        self._movement_generation = 0
 
         self._build_layout()
+        schema_ready.result()
         self.refresh_materials()
-        self.refresh_inventory()
+
+    def destroy(self) -> None:
+        for job in self._tree_jobs.values():
+            self.after_cancel(job)
+        self._tree_jobs.clear()
+        for job in (self._status_job, self._refresh_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._db_executor.shutdown(wait=True, cancel_futures=True)
+        self._read_session.close()
+        self.session.close()
+        super().destroy()
+
+    @contextmanager
+    def _session(self, session: Optional[Session] = None) -> Iterator[Session]:
+        """Run one unit of work on a long-lived session (the main one by default), committing on success.
+
+        Ending the transaction after every action also ends its read snapshot, so the
+        next action sees changes made elsewhere, for example through the web app.
+        """
+        session = session or self.session
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    def _run_db(self, query: Callable[[], T], apply: Callable[[T], None]) -> None:
+        """Run ``query`` on the database thread, then hand its result to ``apply`` on the Tk thread."""
+        self._poll_db(self._db_executor.submit(query), apply)
+
+    def _poll_db(self, future: Future, apply: Callable[[T], None]) -> None:
+        # Tk is not thread-safe, so the worker never touches widgets; the Tk thread polls instead.
+        if not future.done():
+            self.after(DB_POLL_INTERVAL_MS, self._poll_db, future, apply)
+            return
+        try:
+            result = future.result()
+        except Exception as exc:
+            messagebox.showerror("Database error", str(exc))
+            return
+        apply(result)
 
     # ------------------------------------------------------------------
     # Layout helpers
@@ -37,19 +249,53 @@ class StockWorksApp(tk.Tk):
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
 
-        notebook = ttk.Notebook(self)
-        notebook.grid(row=0, column=0, sticky="nsew", padx=12, pady=12)
+        self.notebook = ttk.Notebook(self)
+        self.notebook.grid(row=0, column=0, sticky="nsew", padx=12, pady=12)
+
+        # Successful writes report here instead of in a modal dialog; errors still use messagebox.
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var, anchor="w").grid(
+            row=1, column=0, sticky="ew", padx=12, pady=(0, 8)
+        )
 
-        self.material_tab = self._build_material_tab(notebook)
-        self.inventory_tab = self._build_inventory_tab(notebook)
-        self.pricing_tab = self._build_pricing_tab(notebook)
+        self.material_tab = ttk.Frame(self.notebook)
+        self.inventory_tab = ttk.Frame(self.notebook)
+        self.pricing_tab = ttk.Frame(self.notebook)
+        self._build_material_tab(self.material_tab)
 
-        notebook.add(self.material_tab, text="Materials")
-        notebook.add(self.inventory_tab, text="Inventory")
-        notebook.add(self.pricing_tab, text="Pricing")
+        self.notebook.add(self.material_tab, text="Materials")
+        self.notebook.add(self.inventory_tab, text="Inventory")
+        self.notebook.add(self.pricing_tab, text="Pricing")
 
-    def _build_material_tab(self, notebook: ttk.Notebook) -> ttk.Frame:
-        tab = ttk.Frame(notebook)
+        # Only the Materials tab is visible at launch; the others are filled in the first time
+        # they are selected, so startup creates fewer widgets and runs a single query.
+        self._tab_builders: Dict[str, Callable[[ttk.Frame], None]] = {
+            str(self.inventory_tab): self._open_inventory_tab,
+            str(self.pricing_tab): self._build_pricing_tab,
+        }
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+    def _show_status(self, message: str) -> None:
+        if self._status_job is not None:
+            self.after_cancel(self._status_job)
+        self.status_var.set(message)
+        self._status_job = self.after(STATUS_CLEAR_MS, self._clear_status)
+
+    def _clear_status(self) -> None:
+        self._status_job = None
+        self.status_var.set("")
+
+    def _on_tab_changed(self, _event: object) -> None:
+        selected = self.notebook.select()
+        build = self._tab_builders.pop(selected, None)
+        if build is not None:
+            build(self.notebook.nametowidget(selected))
+
+    def _open_inventory_tab(self, tab: ttk.Frame) -> None:
+        self._build_inventory_tab(tab)
+        self.refresh_inventory()
+
+    def _build_material_tab(self, tab: ttk.Frame) -> None:
         tab.columnconfigure(0, weight=3)
         tab.columnconfigure(1, weight=2)
         tab.rowconfigure(0, weight=1)
@@ -104,10 +350,7 @@ class StockWorksApp(tk.Tk):
         ttk.Button(btn_frame, text="Delete", command=self.delete_material).grid(row=0, column=2, padx=4)
         ttk.Button(btn_frame, text="Clear", command=self.clear_material_form).grid(row=0, column=3, padx=4)
 
-        return tab
-
-    def _build_inventory_tab(self, notebook: ttk.Notebook) -> ttk.Frame:
-        tab = ttk.Frame(notebook)
+    def _build_inventory_tab(self, tab: ttk.Frame) -> None:
         tab.rowconfigure(0, weight=1)
         tab.columnconfigure(0, weight=3)
         tab.columnconfigure(1, weight=2)
@@ -141,9 +384,13 @@ class StockWorksApp(tk.Tk):
         }
 
         ttk.Label(form, text="Material").grid(row=0, column=0, sticky="w", padx=6, pady=4)
-        material_combo = ttk.Combobox(form, textvariable=self.inventory_vars["material"], state="readonly")
+        material_combo = ttk.Combobox(
+            form, textvariable=self.inventory_vars["material"], values=self.material_choice_values, state="readonly"
+        )
         material_combo.grid(row=0, column=1, sticky="ew", padx=6, pady=4)
-        self.material_comboboxes.append(material_combo)
+        material_combo.bind("<<ComboboxSelected>>", self._on_inventory_material_selected)
+        self.inventory_material_id = tk.IntVar(value=0)
+        self.material_comboboxes.append((material_combo, self.inventory_material_id))
 
         labels = [
             ("location", "Location"),
@@ -182,7 +429,12 @@ class StockWorksApp(tk.Tk):
         move_scroll.grid(row=0, column=0, sticky="nse", padx=(0, 10), pady=(0, 10))
 
         log_frame = ttk.Frame(movement_frame)
-        log_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=(0, 10))
+        self.load_more_movements_button = ttk.Button(
+            movement_frame, text="Load more", command=self.load_more_movements, state="disabled"
+        )
+        self.load_more_movements_button.grid(row=1, column=0, sticky="e", padx=10, pady=(0, 10))
+
+        log_frame.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 10))
         for idx in range(4):
             log_frame.columnconfigure(idx, weight=1)
 
@@ -209,10 +461,7 @@ class StockWorksApp(tk.Tk):
 
         ttk.Button(log_frame, text="Log movement", command=self.log_movement).grid(row=1, column=4, padx=8, pady=4)
 
-        return tab
-
-    def _build_pricing_tab(self, notebook: ttk.Notebook) -> ttk.Frame:
-        tab = ttk.Frame(notebook)
+    def _build_pricing_tab(self, tab: ttk.Frame) -> None:
         tab.columnconfigure(1, weight=1)
 
         fields = [
@@ -232,9 +481,13 @@ class StockWorksApp(tk.Tk):
         for key, label in fields:
             ttk.Label(tab, text=label).grid(row=row, column=0, sticky="w", padx=10, pady=6)
             if key == "material":
-                combo = ttk.Combobox(tab, textvariable=self.pricing_vars[key], state="readonly")
+                combo = ttk.Combobox(
+                    tab, textvariable=self.pricing_vars[key], values=self.material_choice_values, state="readonly"
+                )
                 combo.grid(row=row, column=1, sticky="ew", padx=10, pady=6)
-                self.material_comboboxes.append(combo)
+                combo.bind("<<ComboboxSelected>>", self._on_pricing_material_selected)
+                self.pricing_material_id = tk.IntVar(value=0)
+                self.material_comboboxes.append((combo, self.pricing_material_id))
             else:
                 ttk.Entry(tab, textvariable=self.pricing_vars[key]).grid(row=row, column=1, sticky="ew", padx=10, pady=6)
             row += 1
@@ -247,19 +500,17 @@ class StockWorksApp(tk.Tk):
             row=row, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10)
         )
 
-        return tab
-
     # ------------------------------------------------------------------
     # Material actions
     def add_material(self) -> None:
         data = self._material_form_values(require_all=True)
         if not data:
             return
-        with session_scope() as session:
+        with self._session() as session:
             session.add(Material(**data))
-        self.refresh_materials()
+        self._schedule_refresh("materials")
         self.clear_material_form()
-        messagebox.showinfo("Material created", "Material added successfully.")
+        self._show_status("Material added.")
 
     def update_material(self) -> None:
         material_id = self._selected_material_id()
@@ -269,16 +520,16 @@ class StockWorksApp(tk.Tk):
         data = self._material_form_values(require_all=True)
         if not data:
             return
-        with session_scope() as session:
-            material = session.get(Material, material_id)
+        with self._session() as session:
+            material = session.get(Material, material_id, populate_existing=True)
             if not material:
                 messagebox.showerror("Not found", "Material could not be located.")
                 return
             for key, value in data.items():
                 setattr(material, key, value)
             session.add(material)
-        self.refresh_materials()
-        messagebox.showinfo("Material updated", "Changes saved.")
+        self._schedule_refresh("materials")
+        self._show_status("Material changes saved.")
 
     def delete_material(self) -> None:
         material_id = self._selected_material_id()
@@ -287,38 +538,57 @@ class StockWorksApp(tk.Tk):
             return
         if not messagebox.askyesno("Delete material", "Delete the selected material and related inventory?"):
             return
-        with session_scope() as session:
-            material = session.get(Material, material_id)
+        with self._session() as session:
+            material = session.get(Material, material_id, populate_existing=True)
             if not material:
                 messagebox.showerror("Not found", "Material could not be located.")
                 return
             # cascade removal will drop inventory via FK constraints
             session.delete(material)
-        self.refresh_materials()
-        self.refresh_inventory()
+        self._schedule_refresh("materials")
+        self._schedule_refresh("inventory")
         self.clear_material_form()
-        messagebox.showinfo("Material deleted", "Material removed.")
+        self._show_status("Material removed.")
+
+    def _schedule_refresh(self, kind: str) -> None:
+        """Queue a refresh of the ``"materials"`` or ``"inventory"`` list for the next debounce window."""
+        self._pending_refresh.add(kind)
+        if self._refresh_job is None:
+            self._refresh_job = self.after(REFRESH_DEBOUNCE_MS, self._drain_refresh)
+
+    def _drain_refresh(self) -> None:
+        self._refresh_job = None
+        pending, self._pending_refresh = self._pending_refresh, set()
+        if "materials" in pending:
+            self.refresh_materials()
+        if "inventory" in pending:
+            self.refresh_inventory()
 
     def refresh_materials(self) -> None:
-        self.material_tree.delete(*self.material_tree.get_children())
-        with session_scope() as session:
-            materials = session.exec(select(Material).order_by(Material.name)).all()
-        self.material_cache = {m.id: m for m in materials if m.id is not None}
-        for material in materials:
-            self.material_tree.insert(
-                "",
-                "end",
-                iid=str(material.id),
-                values=(
+        self._run_db(self._query_materials, self._apply_materials)
+
+    def _query_materials(self) -> List[MaterialRow]:
+        with self._session(self._read_session) as session:
+            return [MaterialRow(*row) for row in session.exec(_MATERIALS_STATEMENT)]
+
+    def _apply_materials(self, materials: List[MaterialRow]) -> None:
+        self.material_cache = {m.id: m for m in materials}
+        rows = [
+            (
+                str(material.id),
+                (
                     material.name,
                     material.filament_type,
                     material.color,
-                    f"${material.price_per_gram:.4f}",
+                    _UNIT_PRICE_FORMAT(material.price_per_gram),
                     material.spool_weight_grams,
                     material.supplier or "",
                     material.brand or "",
                 ),
             )
+            for material in materials
+        ]
+        self._sync_tree(self.material_tree, self._material_row_cache, rows)
         self._update_material_comboboxes(materials)
 
     def clear_material_form(self) -> None:
@@ -328,10 +598,9 @@ class StockWorksApp(tk.Tk):
         self.material_tree.selection_remove(self.material_tree.selection())
 
     def _material_form_values(self, *, require_all: bool) -> Optional[Dict[str, object]]:
-        try:
-            price = float(self.material_vars["price_per_gram"].get())
-            spool = int(self.material_vars["spool_weight_grams"].get())
-        except ValueError:
+        price_ok, price = _parse_float(self.material_vars["price_per_gram"].get().strip())
+        spool_ok, spool = _parse_int(self.material_vars["spool_weight_grams"].get().strip())
+        if not (price_ok and spool_ok):
             messagebox.showerror("Invalid input", "Price per gram and spool weight must be numeric.")
             return None
 
@@ -343,7 +612,8 @@ class StockWorksApp(tk.Tk):
             "brand": self.material_vars["brand"].get().strip() or None,
             "price_per_gram": price,
             "spool_weight_grams": spool,
-            "notes": self.material_notes.get("1.0", "end").strip() or None,
+            # "end-1c" leaves out the newline Tk always keeps at the end of a Text widget.
+            "notes": self.material_notes.get("1.0", "end-1c") or None,
         }
         if require_all and not all(data[field] for field in ("name", "filament_type", "color")):
             messagebox.showerror("Missing fields", "Name, filament type, and color are required.")
@@ -379,11 +649,11 @@ class StockWorksApp(tk.Tk):
         payload = self._inventory_form_values()
         if not payload:
             return
-        with session_scope() as session:
+        with self._session() as session:
             session.add(InventoryItem(**payload))
-        self.refresh_inventory()
+        self._schedule_refresh("inventory")
         self.clear_inventory_form()
-        messagebox.showinfo("Inventory added", "Inventory item created.")
+        self._show_status("Inventory item created.")
 
     def update_inventory(self) -> None:
         item_id = self._selected_inventory_id()
@@ -393,16 +663,16 @@ class StockWorksApp(tk.Tk):
         payload = self._inventory_form_values()
         if not payload:
             return
-        with session_scope() as session:
-            item = session.get(InventoryItem, item_id)
+        with self._session() as session:
+            item = session.get(InventoryItem, item_id, populate_existing=True)
             if not item:
                 messagebox.showerror("Not found", "Inventory item no longer exists.")
                 return
             for key, value in payload.items():
                 setattr(item, key, value)
             session.add(item)
-        self.refresh_inventory()
-        messagebox.showinfo("Inventory updated", "Inventory item saved.")
+        self._schedule_refresh("inventory")
+        self._show_status("Inventory item saved.")
 
     def delete_inventory(self) -> None:
         item_id = self._selected_inventory_id()
@@ -411,16 +681,16 @@ class StockWorksApp(tk.Tk):
             return
         if not messagebox.askyesno("Delete inventory", "Delete the selected inventory entry and its movements?"):
             return
-        with session_scope() as session:
-            item = session.get(InventoryItem, item_id)
+        with self._session() as session:
+            item = session.get(InventoryItem, item_id, populate_existing=True)
             if not item:
                 messagebox.showerror("Not found", "Inventory item no longer exists.")
                 return
             session.delete(item)
-        self.refresh_inventory()
+        self._schedule_refresh("inventory")
         self.clear_inventory_form()
-        self.movement_tree.delete(*self.movement_tree.get_children())
-        messagebox.showinfo("Inventory deleted", "Inventory entry removed.")
+        self._load_movements_for(None)
+        self._show_status("Inventory entry removed.")
 
     def log_movement(self) -> None:
         item_id = self._selected_inventory_id()
@@ -428,9 +698,8 @@ class StockWorksApp(tk.Tk):
             messagebox.showwarning("Select item", "Select an inventory item before logging a movement.")
             return
         movement_type = self.movement_type_var.get()
-        try:
-            change_value = float(self.movement_change_var.get())
-        except ValueError:
+        change_ok, change_value = _parse_float(self.movement_change_var.get().strip())
+        if not change_ok:
             messagebox.showerror("Invalid input", "Change amount must be numeric.")
             return
         if movement_type in {"incoming", "outgoing"}:
@@ -444,75 +713,88 @@ class StockWorksApp(tk.Tk):
                 return
             change = change_value
 
-        with session_scope() as session:
-            item = session.get(InventoryItem, item_id)
-            if not item:
-                messagebox.showerror("Not found", "Inventory item no longer exists.")
-                return
-            new_qty = item.quantity_grams + change
-            if new_qty < 0:
-                messagebox.showerror("Invalid movement", "Resulting quantity cannot be negative.")
-                return
-            movement = StockMovement(
-                inventory_item_id=item_id,
-                movement_type=movement_type,
-                change_grams=change,
-                reference=self.movement_ref_var.get().strip() or None,
-                note=self.movement_note_var.get().strip() or None,
+        error: Optional[Tuple[str, str]] = None
+        with self._session() as session:
+            # Apply the delta in the database, guarded in the same statement, so a movement
+            # logged concurrently (for example through the web app) cannot be overwritten.
+            new_quantity = InventoryItem.quantity_grams + change
+            result = session.exec(
+                update(InventoryItem)
+                .where(InventoryItem.id == item_id, new_quantity >= 0)
+                .values(quantity_grams=new_quantity)
             )
-            item.quantity_grams = new_qty
-            session.add(item)
-            session.add(movement)
+            if result.rowcount == 0:
+                # End the write transaction first: it holds the SQLite write lock, and the
+                # error dialog below is modal and is only shown once the session is released.
+                session.rollback()
+                if session.exec(select(InventoryItem.id).where(InventoryItem.id == item_id)).first() is None:
+                    error = ("Not found", "Inventory item no longer exists.")
+                else:
+                    error = ("Invalid movement", "Resulting quantity cannot be negative.")
+            else:
+                movement = StockMovement(
+                    inventory_item_id=item_id,
+                    movement_type=movement_type,
+                    change_grams=change,
+                    reference=self.movement_ref_var.get().strip() or None,
+                    note=self.movement_note_var.get().strip() or None,
+                )
+                session.add(movement)
+        if error:
+            messagebox.showerror(*error)
+            return
 
-        self.refresh_inventory()
+        self._schedule_refresh("inventory")
         self._load_movements_for(item_id)
         self.movement_change_var.set("")
         self.movement_note_var.set("")
         self.movement_ref_var.set("")
-        messagebox.showinfo("Movement logged", "Stock movement saved.")
+        self._show_status("Stock movement saved.")
 
     def refresh_inventory(self) -> None:
-        self.inventory_tree.delete(*self.inventory_tree.get_children())
-        with session_scope() as session:
-            statement = select(InventoryItem).order_by(InventoryItem.location)
-            items = session.exec(statement).all()
-            # eager load material relationship
-            for item in items:
-                _ = item.material
+        if str(self.inventory_tab) in self._tab_builders:
+            # Not opened yet; the list is loaded when the tab is first shown.
+            return
+        self._run_db(self._query_inventory, self._apply_inventory)
+
+    def _query_inventory(self) -> List[Row]:
+        with self._session(self._read_session) as session:
+            return list(session.exec(_INVENTORY_STATEMENT))
+
+    def _apply_inventory(self, items: List[Row]) -> None:
         self.inventory_cache = {item.id: item for item in items if item.id is not None}
-        for item in items:
-            material_label = self._format_material_label(item.material)
-            self.inventory_tree.insert(
-                "",
-                "end",
-                iid=str(item.id),
-                values=(
-                    material_label,
+        rows = [
+            (
+                str(item.id),
+                (
+                    self._format_material_label(item.material_name, item.material_color),
                     item.location,
-                    f"{item.quantity_grams:.2f}",
-                    f"{item.reorder_level:.2f}",
+                    _GRAMS_FORMAT(item.quantity_grams),
+                    _GRAMS_FORMAT(item.reorder_level),
                     item.spool_serial or "",
-                    f"${item.unit_cost_override:.4f}" if item.unit_cost_override else "",
+                    _UNIT_PRICE_FORMAT(item.unit_cost_override) if item.unit_cost_override else "",
                 ),
             )
+            for item in items
+        ]
+        self._sync_tree(self.inventory_tree, self._inventory_row_cache, rows)
 
     def clear_inventory_form(self) -> None:
         for var in self.inventory_vars.values():
             var.set("")
+        self.inventory_material_id.set(0)
         self.inventory_tree.selection_remove(self.inventory_tree.selection())
 
     def _inventory_form_values(self) -> Optional[Dict[str, object]]:
-        material_value = self.inventory_vars["material"].get()
-        material_id = self._material_id_from_choice(material_value)
+        material_id = self.inventory_material_id.get()
         if not material_id:
             messagebox.showerror("Missing material", "Select a material for the inventory entry.")
             return None
-        try:
-            quantity = float(self.inventory_vars["quantity_grams"].get() or 0)
-            reorder = float(self.inventory_vars["reorder_level"].get() or 0)
-            unit_cost = self.inventory_vars["unit_cost_override"].get().strip()
-            unit_cost_val = float(unit_cost) if unit_cost else None
-        except ValueError:
+        quantity_ok, quantity = _parse_float(self.inventory_vars["quantity_grams"].get().strip(), 0.0)
+        reorder_ok, reorder = _parse_float(self.inventory_vars["reorder_level"].get().strip(), 0.0)
+        unit_cost = self.inventory_vars["unit_cost_override"].get().strip()
+        unit_cost_ok, unit_cost_val = _parse_float(unit_cost) if unit_cost else (True, None)
+        if not (quantity_ok and reorder_ok and unit_cost_ok):
             messagebox.showerror("Invalid input", "Quantity, reorder level, and unit cost must be numeric.")
             return None
         location = self.inventory_vars["location"].get().strip()
@@ -541,9 +823,10 @@ class StockWorksApp(tk.Tk):
         item = self.inventory_cache.get(item_id)
         if not item:
             return
-        material_choice = self._format_material_choice(item.material)
+        material_choice = self._format_material_choice(self.material_cache.get(item.material_id))
         if material_choice:
             self.inventory_vars["material"].set(material_choice)
+            self.inventory_material_id.set(item.material_id)
         self.inventory_vars["location"].set(item.location)
         self.inventory_vars["quantity_grams"].set(str(item.quantity_grams))
         self.inventory_vars["reorder_level"].set(str(item.reorder_level))
@@ -551,95 +834,187 @@ class StockWorksApp(tk.Tk):
         self.inventory_vars["unit_cost_override"].set(str(item.unit_cost_override or ""))
         self._load_movements_for(item_id)
 
-    def _load_movements_for(self, item_id: int) -> None:
-        self.movement_tree.delete(*self.movement_tree.get_children())
-        with session_scope() as session:
-            statement = (
-                select(StockMovement)
-                .where(StockMovement.inventory_item_id == item_id)
-                .order_by(StockMovement.created_at.desc())
-            )
-            movements = session.exec(statement).all()
-        for movement in movements:
-            timestamp = movement.created_at.strftime("%Y-%m-%d %H:%M")
-            self.movement_tree.insert(
-                "",
-                "end",
-                values=(
-                    timestamp,
+    def _load_movements_for(self, item_id: Optional[int]) -> None:
+        """Show the newest page of movements for ``item_id``, or clear the history when it is None."""
+        self._movement_item_id = item_id
+        self._movement_rows = []
+        self._movement_cursor = None
+        self._movement_generation += 1
+        if item_id is None:
+            self.load_more_movements_button.state(["disabled"])
+            self._sync_tree(self.movement_tree, self._movement_row_cache, [])
+            return
+        self._load_movement_page()
+
+    def load_more_movements(self) -> None:
+        if self._movement_item_id is not None:
+            self._load_movement_page()
+
+    def _load_movement_page(self) -> None:
+        """Append the next MOVEMENT_PAGE_SIZE movements, continuing after the last one shown."""
+        params: Dict[str, object] = {"item_id": self._movement_item_id}
+        if self._movement_cursor is None:
+            statement = _MOVEMENT_FIRST_PAGE_STATEMENT
+        else:
+            statement = _MOVEMENT_NEXT_PAGE_STATEMENT
+            params["cursor_created_at"], params["cursor_id"] = self._movement_cursor
+        generation = self._movement_generation
+        # Disabled until the page arrives so a double click cannot request the same page twice.
+        self.load_more_movements_button.state(["disabled"])
+
+        def query() -> list:
+            with self._session(self._read_session) as session:
+                return list(session.exec(statement, params=params).all())
+
+        self._run_db(query, lambda movements: self._apply_movement_page(generation, movements))
+
+    def _apply_movement_page(self, generation: int, movements: list) -> None:
+        if generation != self._movement_generation:
+            return
+        has_more = len(movements) > MOVEMENT_PAGE_SIZE
+        movements = movements[:MOVEMENT_PAGE_SIZE]
+        if movements:
+            self._movement_cursor = (movements[-1].created_at, movements[-1].id)
+        self.load_more_movements_button.state(["!disabled"] if has_more else ["disabled"])
+        self._movement_rows += [
+            (
+                str(movement.id),
+                (
+                    # Same "YYYY-MM-DD HH:MM" text as strftime, but formatted in C without parsing a pattern.
+                    movement.created_at.isoformat(" ", "minutes"),
                     movement.movement_type,
-                    f"{movement.change_grams:+.2f}",
+                    _CHANGE_GRAMS_FORMAT(movement.change_grams),
                     movement.reference or "",
                     movement.note or "",
                 ),
             )
+            for movement in movements
+        ]
+        self._sync_tree(self.movement_tree, self._movement_row_cache, self._movement_rows)
 
     # ------------------------------------------------------------------
     # Pricing actions
     def calculate_quote(self) -> None:
-        material_id = self._material_id_from_choice(self.pricing_vars["material"].get())
+        material_id = self.pricing_material_id.get()
         if not material_id:
             messagebox.showerror("Missing data", "Select a material to quote against.")
             return
-        try:
-            weight = float(self.pricing_vars["weight_grams"].get())
-            hours = float(self.pricing_vars["print_time_hours"].get())
-            machine_rate = float(self.pricing_vars["machine_hour_rate"].get())
-            labor = float(self.pricing_vars["labor_cost"].get() or 0)
-            margin = float(self.pricing_vars["margin_pct"].get() or 0)
-        except ValueError:
+        parsed = [
+            _parse_float(self.pricing_vars[key].get().strip(), default)
+            for key, default in (
+                ("weight_grams", None),
+                ("print_time_hours", None),
+                ("machine_hour_rate", None),
+                ("labor_cost", 0.0),
+                ("margin_pct", 0.0),
+            )
+        ]
+        if not all(ok for ok, _ in parsed):
             messagebox.showerror("Invalid input", "Weight, print time, machine rate, labor, and margin must be numeric.")
             return
+        weight, hours, machine_rate, labor, margin = (value for _, value in parsed)
         if weight <= 0 or hours <= 0 or machine_rate <= 0:
             messagebox.showerror("Invalid input", "Weight, print time, and machine rate must be positive.")
             return
-        with session_scope() as session:
-            material = session.get(Material, material_id)
-            if not material:
-                messagebox.showerror("Not found", "Material could not be loaded.")
-                return
-            material_cost = weight * material.price_per_gram
-            machine_cost = hours * machine_rate
-            subtotal = material_cost + machine_cost + labor
-            margin_amount = subtotal * (margin / 100)
-            total = subtotal + margin_amount
-        result = (
-            f"Material ({material.name}): ${material_cost:.2f}\n"
-            f"Machine time: ${machine_cost:.2f}\n"
-            f"Labor: ${labor:.2f}\n"
-            f"Subtotal: ${subtotal:.2f}\n"
-            f"Margin: ${margin_amount:.2f}\n"
-            f"Total price: ${total:.2f}"
+
+        material = self.material_cache.get(material_id)
+        if not material:
+            messagebox.showerror("Not found", "Material could not be loaded.")
+            return
+        self.pricing_result_var.set(
+            _format_quote(material.name, material.price_per_gram, weight, hours, machine_rate, labor, margin)
         )
-        self.pricing_result_var.set(result)
 
     # ------------------------------------------------------------------
     # Shared helpers
-    def _update_material_comboboxes(self, materials: List[Material]) -> None:
-        self.material_choice_values = [self._format_material_choice(material) for material in materials if material.id]
-        for combo in self.material_comboboxes:
+    def _sync_tree(
+        self,
+        tree: ttk.Treeview,
+        rendered: Dict[str, Tuple[object, ...]],
+        rows: Sequence[Tuple[str, Tuple[object, ...]]],
+    ) -> None:
+        """Make ``tree`` show ``rows`` in order, only touching rows that were added, changed, moved, or removed.
+
+        ``rendered`` maps each iid to the values last written for it and is updated in place.
+        The first TREE_RENDER_CHUNK rows are applied right away; the rest follow in idle-time
+        chunks, and a newer sync of the same tree supersedes one that is still running.
+        """
+        job = self._tree_jobs.pop(str(tree), None)
+        if job is not None:
+            self.after_cancel(job)
+        self._run_tree_steps(tree, self._sync_tree_steps(tree, rendered, rows))
+
+    def _run_tree_steps(self, tree: ttk.Treeview, steps: Iterator[None]) -> None:
+        if next(steps, StopIteration) is StopIteration:
+            self._tree_jobs.pop(str(tree), None)
+            return
+        self._tree_jobs[str(tree)] = self.after_idle(self._run_tree_steps, tree, steps)
+
+    @staticmethod
+    def _sync_tree_steps(
+        tree: ttk.Treeview,
+        rendered: Dict[str, Tuple[object, ...]],
+        rows: Sequence[Tuple[str, Tuple[object, ...]]],
+    ) -> Iterator[None]:
+        # ``rendered`` always mirrors what the tree holds, so an interrupted sync leaves
+        # nothing behind that the next one cannot reconcile.
+        wanted = {iid for iid, _ in rows}
+        stale = [iid for iid in rendered if iid not in wanted]
+        if stale:
+            tree.delete(*stale)
+            for iid in stale:
+                del rendered[iid]
+        order = list(tree.get_children())
+        for index, (iid, values) in enumerate(rows):
+            if index and index % TREE_RENDER_CHUNK == 0:
+                yield None
+            previous = rendered.get(iid)
+            if previous is None:
+                tree.insert("", index, iid=iid, values=values)
+                order.insert(index, iid)
+                rendered[iid] = values
+                continue
+            if previous != values:
+                tree.item(iid, values=values)
+                rendered[iid] = values
+            if index >= len(order) or order[index] != iid:
+                tree.move(iid, "", index)
+                order.remove(iid)
+                order.insert(index, iid)
+
+    def _update_material_comboboxes(self, materials: List[MaterialRow]) -> None:
+        choice_to_id = {self._format_material_choice(material): material.id for material in materials}
+        choices = list(choice_to_id)
+        # Assigning ["values"] re-marshals the whole list into Tcl; skip it when nothing changed.
+        if choices == self.material_choice_values:
+            return
+        self.material_choice_values = choices
+        self._choice_to_id = choice_to_id
+        for combo, selected_id in self.material_comboboxes:
             combo["values"] = self.material_choice_values
             if combo.get() not in self.material_choice_values:
                 combo.set("")
+                selected_id.set(0)
+
+    def _on_inventory_material_selected(self, _event: object) -> None:
+        self.inventory_material_id.set(self._material_id_from_choice(self.inventory_vars["material"].get()) or 0)
 
-    def _format_material_choice(self, material: Optional[Material]) -> Optional[str]:
-        if not material or material.id is None:
+    def _on_pricing_material_selected(self, _event: object) -> None:
+        self.pricing_material_id.set(self._material_id_from_choice(self.pricing_vars["material"].get()) or 0)
+
+    def _format_material_choice(self, material: Optional[MaterialRow]) -> Optional[str]:
+        if not material:
             return None
         return f"{material.id} • {material.name} ({material.color})"
 
-    def _format_material_label(self, material: Optional[Material]) -> str:
-        if not material:
+    @staticmethod
+    def _format_material_label(name: Optional[str], color: Optional[str]) -> str:
+        if name is None:
             return ""
-        return f"{material.name} ({material.color})"
+        return f"{name} ({color})"
 
     def _material_id_from_choice(self, value: str) -> Optional[int]:
-        if not value or "•" not in value:
-            return None
-        token = value.split("•", 1)[0].strip()
-        try:
-            return int(token)
-        except ValueError:
-            return None
+        return self._choice_to_id.get(value)
 
     def run(self) -> None:
         self.mainloop()
@@ -1,8 +1,38 @@
 """SQLModel models for the StockWorks domain."""
-from datetime import datetime
-from typing import List, Optional
+import io
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Type, Union
 
-from sqlmodel import Field, Relationship, SQLModel
+from pydantic import ConfigDict, create_model
+from sqlalchemy import Index, insert
+from sqlmodel import Field, Relationship, Session, SQLModel
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as a naive datetime, the form movement timestamps are stored in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _make_update_model(base: Type[SQLModel], name: str, **extra_fields: Any) -> Type[SQLModel]:
+    """Derive a PATCH-style schema from ``base``: every field optional, constraints kept.
+
+    Validators such as ``gt=0`` still apply whenever a value is supplied, so the update schema
+    cannot drift from the create schema as fields are added.
+    """
+    fields: Dict[str, Any] = {}
+    for field_name, field in base.model_fields.items():
+        annotation = field.annotation
+        if field.metadata:
+            annotation = Annotated[(annotation, *field.metadata)]
+        fields[field_name] = (Optional[annotation], Field(default=None, description=field.description))
+    fields.update(extra_fields)
+    return create_model(name, __base__=SQLModel, __module__=__name__, **fields)
+
+
+# Response schemas are built once per row and never mutated: freeze them, and compile their
+# validators on first use rather than at import time.
+_READ_MODEL_CONFIG = ConfigDict(frozen=True, defer_build=True, from_attributes=True)
 
 
 class MaterialBase(SQLModel):
@@ -19,6 +49,9 @@ class MaterialBase(SQLModel):
 
 
 class Material(MaterialBase, table=True):
+    # Material lists (API and desktop GUI) are ordered by name
+    __table_args__ = (Index("ix_material_name", "name"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     inventory_items: List["InventoryItem"] = Relationship(back_populates="material")
 
@@ -27,20 +60,12 @@ class MaterialCreate(MaterialBase):
     pass
 
 
-class MaterialUpdate(SQLModel):
-    name: Optional[str] = None
-    brand: Optional[str] = None
-    filament_type: Optional[str] = None
-    category: Optional[str] = None
-    color: Optional[str] = None
-    supplier: Optional[str] = None
-    price_per_gram: Optional[float] = Field(default=None, gt=0)
-    spool_weight_grams: Optional[int] = Field(default=None, gt=0)
-    barcode: Optional[str] = None
-    notes: Optional[str] = None
+MaterialUpdate = _make_update_model(MaterialBase, "MaterialUpdate")
 
 
 class MaterialRead(MaterialBase):
+    model_config = _READ_MODEL_CONFIG
+
     id: int
 
 
@@ -53,10 +78,17 @@ class InventoryItemBase(SQLModel):
 
 
 class InventoryItem(InventoryItemBase, table=True):
+    # The desktop GUI lists inventory ordered by location
+    __table_args__ = (Index("ix_inventoryitem_location", "location"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     material_id: int = Field(foreign_key="material.id")
 
-    material: Optional[Material] = Relationship(back_populates="inventory_items")
+    # InventoryItemRead embeds the material, so load it for every item in one IN query.
+    # The movement collections below stay lazy: history is unbounded and served paginated.
+    material: Optional[Material] = Relationship(
+        back_populates="inventory_items", sa_relationship_kwargs={"lazy": "selectin"}
+    )
     movements: List["StockMovement"] = Relationship(back_populates="inventory_item")
 
 
@@ -64,16 +96,14 @@ class InventoryItemCreate(InventoryItemBase):
     material_id: int
 
 
-class InventoryItemUpdate(SQLModel):
-    location: Optional[str] = None
-    quantity_grams: Optional[float] = Field(default=None, ge=0)
-    reorder_level: Optional[float] = Field(default=None, ge=0)
-    spool_serial: Optional[str] = None
-    unit_cost_override: Optional[float] = Field(default=None, ge=0)
-    material_id: Optional[int] = None
+InventoryItemUpdate = _make_update_model(
+    InventoryItemBase, "InventoryItemUpdate", material_id=(Optional[int], None)
+)
 
 
 class InventoryItemRead(InventoryItemBase):
+    model_config = _READ_MODEL_CONFIG
+
     id: int
     material_id: int
     material: Optional[MaterialRead]
@@ -87,9 +117,12 @@ class StockMovementBase(SQLModel):
 
 
 class StockMovement(StockMovementBase, table=True):
+    # Backs the per-item history listing: WHERE inventory_item_id = ? ORDER BY created_at DESC
+    __table_args__ = (Index("ix_stockmovement_inventory_item_id_created_at", "inventory_item_id", "created_at"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     inventory_item_id: int = Field(foreign_key="inventoryitem.id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
 
     inventory_item: Optional[InventoryItem] = Relationship(back_populates="movements")
 
@@ -99,6 +132,8 @@ class StockMovementCreate(StockMovementBase):
 
 
 class StockMovementRead(StockMovementBase):
+    model_config = _READ_MODEL_CONFIG
+
     id: int
     inventory_item_id: int
     created_at: datetime
@@ -123,6 +158,8 @@ class PricingBreakdown(SQLModel):
 
 
 class PricingResponse(SQLModel):
+    model_config = _READ_MODEL_CONFIG
+
     pricing: PricingBreakdown
     material_snapshot: MaterialRead
 
@@ -149,20 +186,12 @@ class HardwareItemCreate(HardwareItemBase):
     pass
 
 
-class HardwareItemUpdate(SQLModel):
-    name: Optional[str] = None
-    category: Optional[str] = None
-    supplier: Optional[str] = None
-    manufacturer_part_number: Optional[str] = None
-    unit_of_measure: Optional[str] = None
-    unit_cost: Optional[float] = Field(default=None, ge=0)
-    bin_location: Optional[str] = None
-    reorder_level: Optional[float] = Field(default=None, ge=0)
-    quantity_on_hand: Optional[float] = Field(default=None, ge=0)
-    notes: Optional[str] = None
+HardwareItemUpdate = _make_update_model(HardwareItemBase, "HardwareItemUpdate")
 
 
 class HardwareItemRead(HardwareItemBase):
+    model_config = _READ_MODEL_CONFIG
+
     id: int
 
 
@@ -174,9 +203,11 @@ class HardwareMovementBase(SQLModel):
 
 
 class HardwareMovement(HardwareMovementBase, table=True):
+    __table_args__ = (Index("ix_hardwaremovement_hardware_item_id_created_at", "hardware_item_id", "created_at"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     hardware_item_id: int = Field(foreign_key="hardwareitem.id")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
 
     hardware_item: Optional[HardwareItem] = Relationship(back_populates="movements")
 
@@ -186,6 +217,65 @@ class HardwareMovementCreate(HardwareMovementBase):
 
 
 class HardwareMovementRead(HardwareMovementBase):
+    model_config = _READ_MODEL_CONFIG
+
     id: int
     hardware_item_id: int
     created_at: datetime
+
+
+# Rows per INSERT batch in bulk_create_movements: large enough to amortise each round trip,
+# small enough that only one batch of row dicts is held in memory at a time.
+MOVEMENT_INSERT_CHUNK = 1000
+
+
+def bulk_create_movements(
+    session: Session,
+    model: Union[Type[StockMovement], Type[HardwareMovement]],
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int = MOVEMENT_INSERT_CHUNK,
+) -> int:
+    """Insert movement rows (dicts of column values) in batches and return how many were written.
+
+    ``rows`` is consumed lazily, so a generator over a large import never has to be fully
+    materialised. Each batch is a single multi-row INSERT, or a ``COPY ... FROM STDIN`` on
+    PostgreSQL; ``created_at`` defaults to now when a row omits it. Only the movement history
+    is written: item quantities are left untouched.
+    """
+    connection = session.connection()
+    use_copy = connection.dialect.name == "postgresql"
+    statement = insert(model)
+    iterator = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return total
+        if use_copy:
+            _copy_movements(connection, model, chunk)
+        else:
+            session.execute(statement, chunk)
+        total += len(chunk)
+
+
+# COPY text format: backslash escapes for the delimiter and line breaks, \N for NULL.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value: Any) -> str:
+    return "\\N" if value is None else str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_movements(connection: Any, model: Type[SQLModel], rows: List[Dict[str, Any]]) -> None:
+    """Load ``rows`` through psycopg2's ``copy_expert``, bypassing per-row bind-parameter processing."""
+    columns = [column.name for column in model.__table__.columns if not column.primary_key]
+    now = _utcnow()
+    buffer = io.StringIO()
+    for row in rows:
+        values = {**row, "created_at": row.get("created_at") or now}
+        buffer.write("\t".join(_copy_value(values.get(column)) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    sql = f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN"
+    with connection.connection.cursor() as cursor:
+        cursor.copy_expert(sql, buffer)
@@ -1,18 +1,47 @@
 """OrderWorks integration helpers."""
 from __future__ import annotations
 
+import asyncio
 import os
-import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import httpx
+import orjson
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlmodel import Session
 
+from .cache import TTLCache
+
+ORDERWORKS_LOGIN_PATH = "/api/auth/login"
+ORDERWORKS_JOBS_PATH = "/api/jobs"
+ORDERWORKS_SESSION_COOKIE = "orderworks_admin_session"
+# The login's only header, built once instead of on every call.
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+# Session lifetime assumed when the login cookie carries no Expires/Max-Age.
 ORDERWORKS_SESSION_REFRESH_SECONDS = 60 * 60 * 6  # refresh every 6 hours
+ORDERWORKS_JOBS_YIELD_PER = 100  # rows fetched per batch when reading jobs from the database
+ORDERWORKS_HTTP_MAX_CONNECTIONS = 32
+ORDERWORKS_HTTP_MAX_KEEPALIVE = 16
+# Idle connections are kept this long; match the OrderWorks server's Keep-Alive timeout.
+ORDERWORKS_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("ORDERWORKS_KEEPALIVE_EXPIRY", "60"))
+ORDERWORKS_CONNECT_RETRIES = 2
+# Log in at application startup so the first Orders request finds a warm session and connection.
+ORDERWORKS_EAGER_LOGIN = os.environ.get("ORDERWORKS_EAGER_LOGIN", "1") == "1"
+# The Orders tab polls the job list; within this many seconds repeat calls reuse the last result.
+ORDERWORKS_JOBS_CACHE_TTL_SECONDS = float(os.environ.get("ORDERWORKS_JOBS_CACHE_TTL", "10"))
+_JOBS_CACHE = TTLCache(ttl=ORDERWORKS_JOBS_CACHE_TTL_SECONDS)
+# Shared read-only stand-in for "no query parameters", so unparameterised calls allocate nothing.
+_EMPTY_PARAMS: Mapping[str, Any] = MappingProxyType({})
+
+
+def invalidate_orderworks_jobs_cache() -> None:
+    """Drop cached job lists so the next read goes back to OrderWorks."""
+    _JOBS_CACHE.clear()
 
 
 class OrderWorksIntegrationError(Exception):
@@ -31,44 +60,109 @@ class OrderWorksDatabaseUnavailableError(OrderWorksIntegrationError):
     """Raised when OrderWorks tables cannot be queried via the shared database."""
 
 
-class OrderWorksClient:
-    """Simple client for communicating with the OrderWorks admin API."""
+class AsyncOrderWorksClient:
+    """Async client for the OrderWorks admin API.
+
+    Requests run on the event loop, so a slow OrderWorks round trip does not hold a worker
+    thread; one instance (see ``get_orderworks_client``) is shared by every request.
+    """
 
-    def __init__(self, base_url: Optional[str], username: Optional[str], password: Optional[str], timeout: float = 20.0):
+    def __init__(
+        self,
+        base_url: Optional[str],
+        username: Optional[str],
+        password: Optional[str],
+        timeout: float = 20.0,
+        keepalive_expiry: float = ORDERWORKS_KEEPALIVE_EXPIRY_SECONDS,
+    ):
         self.base_url = (base_url or "").rstrip("/")
         self.username = (username or "").strip()
         self.password = (password or "").strip()
         self._timeout = timeout
-        self._client: Optional[httpx.Client] = None
+        self._keepalive_expiry = keepalive_expiry
+        self._client: Optional[httpx.AsyncClient] = None
         self._session_expires_at: float = 0.0
-        self._lock = threading.Lock()
+        self._lock = asyncio.Lock()
+        self._warm_up: Optional[asyncio.Task[None]] = None
+        # Last ETag and job list per list_jobs cache key, for conditional re-fetches.
+        self._jobs_etags: Dict[str, Tuple[str, List[Any]]] = {}
 
     @property
     def is_configured(self) -> bool:
         return bool(self.base_url and self.username and self.password)
 
-    def _get_client(self) -> httpx.Client:
+    def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             if not self.base_url:
                 raise OrderWorksNotConfiguredError("OrderWorks base URL is not configured.")
-            self._client = httpx.Client(base_url=self.base_url, timeout=self._timeout, follow_redirects=False)
+            # One long-lived client: HTTP/2 multiplexes concurrent calls over a kept-alive
+            # connection, and the transport retries a failed connect before giving up.
+            limits = httpx.Limits(
+                max_connections=ORDERWORKS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=ORDERWORKS_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=self._keepalive_expiry,
+            )
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self._timeout,
+                follow_redirects=False,
+                transport=httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=ORDERWORKS_CONNECT_RETRIES),
+            )
         return self._client
 
+    def start_login(self) -> None:
+        """Begin logging in in the background; requests made meanwhile wait for it on the lock.
+
+        A failure is not raised here: the next request retries the login and reports it.
+        """
+        if self.is_configured and self._warm_up is None:
+            self._warm_up = asyncio.get_running_loop().create_task(self._login_quietly())
+
+    async def _login_quietly(self) -> None:
+        try:
+            await self._login()
+        except OrderWorksIntegrationError:
+            pass
+
+    async def aclose(self) -> None:
+        if self._warm_up is not None:
+            self._warm_up.cancel()
+            self._warm_up = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._session_expires_at = 0.0
+
     def _session_valid(self) -> bool:
-        return self._session_expires_at > time.time()
+        # Monotonic, so a wall-clock jump cannot expire or extend the session early.
+        return self._session_expires_at > time.monotonic()
 
-    def _login(self, force: bool = False) -> None:
+    def _needs_login(self, rejected_session: Optional[float]) -> bool:
+        return not self._session_valid() or self._session_expires_at == rejected_session
+
+    async def _login(self, rejected_session: Optional[float] = None) -> None:
+        """Log in unless a usable session exists.
+
+        ``rejected_session`` is the expiry stamp of a session OrderWorks answered 401 for. Only
+        that exact session is replaced: when several in-flight requests are rejected together,
+        the first caller logs in and the rest, queued on the lock, find a newer session and
+        retry with it instead of each posting their own login.
+        """
         if not self.is_configured:
             raise OrderWorksNotConfiguredError("OrderWorks integration is not configured.")
-        with self._lock:
-            if self._session_valid() and not force:
+        # Reading the expiry needs no lock; only a refresh does, and it re-checks once inside.
+        if not self._needs_login(rejected_session):
+            return
+        async with self._lock:
+            if not self._needs_login(rejected_session):
                 return
             client = self._get_client()
             client.cookies.clear()
             try:
-                response = client.post(
-                    "/api/auth/login",
-                    json={"username": self.username, "password": self.password},
+                response = await client.post(
+                    ORDERWORKS_LOGIN_PATH,
+                    content=orjson.dumps({"username": self.username, "password": self.password}),
+                    headers=_JSON_CONTENT_TYPE,
                 )
             except httpx.HTTPError as exc:
                 raise OrderWorksIntegrationError(f"Failed to contact OrderWorks during login: {exc}") from exc
@@ -78,55 +172,99 @@ class OrderWorksClient:
                 response.raise_for_status()
             except httpx.HTTPStatusError as exc:
                 raise OrderWorksIntegrationError(f"OrderWorks login failed: {exc}") from exc
-            if "orderworks_admin_session" not in client.cookies:
+            if ORDERWORKS_SESSION_COOKIE not in client.cookies:
                 raise OrderWorksIntegrationError("OrderWorks login did not return a session cookie.")
-            self._session_expires_at = time.time() + ORDERWORKS_SESSION_REFRESH_SECONDS
+            self._session_expires_at = time.monotonic() + _session_lifetime(client.cookies)
 
-    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
         if not self.is_configured:
             raise OrderWorksNotConfiguredError("OrderWorks integration is not configured.")
-        self._login()
+        await self._login()
+        session = self._session_expires_at
         client = self._get_client()
         try:
-            response = client.request(method, path, **kwargs)
+            response = await client.request(method, path, **kwargs)
         except httpx.HTTPError as exc:
             raise OrderWorksIntegrationError(f"Failed to contact OrderWorks: {exc}") from exc
         if response.status_code == 401:
-            self._login(force=True)
+            await self._login(rejected_session=session)
             try:
-                response = client.request(method, path, **kwargs)
+                response = await client.request(method, path, **kwargs)
             except httpx.HTTPError as exc:
                 raise OrderWorksIntegrationError(f"Failed to contact OrderWorks after refreshing the session: {exc}") from exc
         return response
 
-    def list_jobs(self, params: Optional[Dict[str, Any]] = None) -> Any:
-        response = self._request("GET", "/api/jobs", params=params or {})
+    async def list_jobs(self, params: Optional[Mapping[str, Any]] = None) -> Any:
+        params = params or _EMPTY_PARAMS
+        cache_key = f"orderworks:jobs:http:{sorted(params.items())}"
+        jobs = _JOBS_CACHE.get(cache_key)
+        if jobs is None:
+            jobs = await self._fetch_jobs(params, cache_key)
+            _JOBS_CACHE.set(cache_key, jobs)
+        return jobs
+
+    async def list_jobs_many(self, param_list: Sequence[Optional[Mapping[str, Any]]]) -> List[Any]:
+        """Run several ``list_jobs`` queries concurrently; results follow ``param_list`` order.
+
+        The requests share one session and go out as parallel HTTP/2 streams, so the total
+        wait is close to the slowest query rather than the sum of them.
+        """
+        await self._login()
+        return list(await asyncio.gather(*(self.list_jobs(params) for params in param_list)))
+
+    async def _fetch_jobs(self, params: Mapping[str, Any], cache_key: str) -> List[Any]:
+        # Revalidate the previous result: when nothing changed OrderWorks answers 304 with no
+        # body, so there is nothing to transfer or parse.
+        known = self._jobs_etags.get(cache_key)
+        headers = {"If-None-Match": known[0]} if known else None
+        response = await self._request("GET", ORDERWORKS_JOBS_PATH, params=params, headers=headers)
+        if known and response.status_code == 304:
+            return known[1]
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             raise OrderWorksIntegrationError(f"OrderWorks request failed: {exc}") from exc
         try:
-            data = response.json()
+            # orjson.JSONDecodeError subclasses ValueError.
+            data = orjson.loads(response.content)
         except ValueError as exc:
             raise OrderWorksIntegrationError("OrderWorks returned invalid JSON.") from exc
         jobs = data.get("jobs")
         if not isinstance(jobs, list):
             raise OrderWorksIntegrationError("OrderWorks response did not include jobs.")
+        etag = response.headers.get("etag")
+        if etag:
+            self._jobs_etags[cache_key] = (etag, jobs)
+        else:
+            self._jobs_etags.pop(cache_key, None)
         return jobs
 
 
-_ORDERWORKS_CLIENT: Optional[OrderWorksClient] = None
+def _session_lifetime(cookies: httpx.Cookies) -> float:
+    """Seconds to reuse a fresh login: until shortly before the session cookie expires.
 
+    Refreshing at 90% of the server's lifetime (and at least a minute early) keeps requests
+    from running into the 401-and-retry path near expiry.
+    """
+    for cookie in cookies.jar:
+        if cookie.name == ORDERWORKS_SESSION_COOKIE and cookie.expires is not None:
+            # The cookie jar stores an absolute wall-clock expiry.
+            remaining = cookie.expires - time.time()
+            return max(remaining - max(60.0, remaining * 0.1), 0.0)
+    return ORDERWORKS_SESSION_REFRESH_SECONDS
 
-def get_orderworks_client() -> OrderWorksClient:
-    global _ORDERWORKS_CLIENT
-    if _ORDERWORKS_CLIENT is None:
-        _ORDERWORKS_CLIENT = OrderWorksClient(
-            base_url=os.environ.get("ORDERWORKS_BASE_URL"),
-            username=os.environ.get("ORDERWORKS_ADMIN_USERNAME"),
-            password=os.environ.get("ORDERWORKS_ADMIN_PASSWORD"),
-        )
-    return _ORDERWORKS_CLIENT
+
+@lru_cache(maxsize=1)
+def get_orderworks_client() -> AsyncOrderWorksClient:
+    """Return the process-wide client, built from the environment on first use.
+
+    Call ``get_orderworks_client.cache_clear()`` after changing the ORDERWORKS_* variables.
+    """
+    return AsyncOrderWorksClient(
+        base_url=os.environ.get("ORDERWORKS_BASE_URL"),
+        username=os.environ.get("ORDERWORKS_ADMIN_USERNAME"),
+        password=os.environ.get("ORDERWORKS_ADMIN_PASSWORD"),
+    )
 
 
 @dataclass(frozen=True)
@@ -159,6 +297,11 @@ _ORDERWORKS_JOB_COLUMNS: List[ColumnMapping] = [
     ColumnMapping(("created_at", "createdAt"), "createdAt"),
     ColumnMapping(("updated_at", "updatedAt"), "updatedAt"),
 ]
+_ORDERWORKS_JOB_ALIASES: Tuple[str, ...] = tuple(mapping.alias for mapping in _ORDERWORKS_JOB_COLUMNS)
+# Candidate names lowercased once, to match the keys _fetch_available_columns returns.
+_ORDERWORKS_JOB_COLUMN_LOOKUPS: Tuple[Tuple[ColumnMapping, Tuple[str, ...]], ...] = tuple(
+    (mapping, tuple(name.lower() for name in mapping.names)) for mapping in _ORDERWORKS_JOB_COLUMNS
+)
 
 
 def _quote_identifier(identifier: str) -> str:
@@ -180,49 +323,59 @@ def _quote_table(schema: Optional[str], table: str) -> str:
     return quoted_table
 
 
-def _fetch_available_columns(session: Session, schema: Optional[str], table: str) -> set[str]:
+def _fetch_available_columns(session: Session, schema: Optional[str], table: str) -> Dict[str, str]:
+    """Return the table's column names keyed by their lowercase form."""
     connection = session.connection()
     dialect_name = connection.dialect.name
-    columns: set[str] = set()
     if dialect_name == "sqlite":
         result = connection.exec_driver_sql(f"PRAGMA table_info({table})")
-        columns = {row[1] for row in result}
-    else:
-        params = {"table": table}
-        predicate = "table_name = :table"
-        if schema:
-            params["schema"] = schema
-            predicate += " AND table_schema = :schema"
-        query = text(f"SELECT column_name FROM information_schema.columns WHERE {predicate}")
-        result = connection.execute(query, params)
-        columns = {row[0] for row in result}
-    return columns
-
-
-def _match_column(available: Iterable[str], candidate: str) -> Optional[str]:
-    for existing in available:
-        if existing == candidate or existing.lower() == candidate.lower():
-            return existing
-    return None
+        return {row[1].lower(): row[1] for row in result}
+    params = {"table": table}
+    predicate = "table_name = :table"
+    if schema:
+        params["schema"] = schema
+        predicate += " AND table_schema = :schema"
+    query = text(f"SELECT column_name FROM information_schema.columns WHERE {predicate}")
+    result = connection.execute(query, params)
+    return {row[0].lower(): row[0] for row in result}
 
 
-def _find_matching_column(available: set[str], candidates: Sequence[str]) -> Optional[str]:
-    for candidate in candidates:
-        match = _match_column(available, candidate)
+def _find_matching_column(available: Dict[str, str], lowered_candidates: Sequence[str]) -> Optional[str]:
+    for candidate in lowered_candidates:
+        match = available.get(candidate)
         if match:
             return match
     return None
 
 
+# The jobs SELECT depends only on which columns the OrderWorks table has, so it is built once
+# per dialect and reused; the TTL picks up OrderWorks migrations without a restart.
+_JOBS_QUERY_CACHE_TTL_SECONDS = 300.0
+_JOBS_QUERY_CACHE = TTLCache(ttl=_JOBS_QUERY_CACHE_TTL_SECONDS)
+
+
+def _jobs_query_cache_key(session: Session) -> str:
+    return f"orderworks:jobs-query:{session.connection().dialect.name}:{_ORDERWORKS_JOB_TABLE}"
+
+
 def _build_jobs_query(session: Session) -> text:
+    cache_key = _jobs_query_cache_key(session)
+    query = _JOBS_QUERY_CACHE.get(cache_key)
+    if query is None:
+        query = _introspect_jobs_query(session)
+        _JOBS_QUERY_CACHE.set(cache_key, query)
+    return query
+
+
+def _introspect_jobs_query(session: Session) -> text:
     schema, table = _split_table_identifier(_ORDERWORKS_JOB_TABLE)
     available_columns = _fetch_available_columns(session, schema, table)
     select_parts: List[str] = []
     column_expr_map: Dict[str, Optional[str]] = {}
 
-    for mapping in _ORDERWORKS_JOB_COLUMNS:
+    for mapping, lowered_names in _ORDERWORKS_JOB_COLUMN_LOOKUPS:
         alias_sql = _quote_identifier(mapping.alias)
-        matched_column = _find_matching_column(available_columns, mapping.names)
+        matched_column = _find_matching_column(available_columns, lowered_names)
         if not matched_column:
             if mapping.required:
                 readable = ", ".join(mapping.names)
@@ -259,13 +412,29 @@ def _build_jobs_query(session: Session) -> text:
 
 def list_orderworks_jobs_via_database(session: Session, limit: int = 200) -> List[Dict[str, Any]]:
     """Return OrderWorks jobs directly from the shared MakerWorks/Postgres database."""
+    cache_key = f"orderworks:jobs:db:{limit}"
+    jobs = _JOBS_CACHE.get(cache_key)
+    if jobs is None:
+        jobs = _query_orderworks_jobs(session, limit)
+        _JOBS_CACHE.set(cache_key, jobs)
+    return jobs
+
 
+def _query_orderworks_jobs(session: Session, limit: int) -> List[Dict[str, Any]]:
     try:
         query = _build_jobs_query(session)
-        result = session.exec(query.bindparams(limit=limit))
+        # Bind the limit at execution so the cached statement object is reused as is; its
+        # compiled SQL then comes from the engine's compiled cache on every call after the first.
+        result = session.exec(
+            query, params={"limit": limit}, execution_options={"yield_per": ORDERWORKS_JOBS_YIELD_PER}
+        )
+        # Rows are fetched in batches and copied into dicts as they arrive, so large limits
+        # never hold the driver's row list and the dict copies at the same time. The SELECT
+        # lists every mapping in order, so keys come from the alias tuple, not the row mapping.
+        return [dict(zip(_ORDERWORKS_JOB_ALIASES, row)) for row in result]
     except SQLAlchemyError as exc:
+        # The table may have changed under the cached query; introspect again next time.
+        _JOBS_QUERY_CACHE.clear()
         raise OrderWorksDatabaseUnavailableError(
             f"Unable to query OrderWorks tables via the configured database: {exc}"
         ) from exc
-    rows = result.mappings().all()
-    return [dict(row) for row in rows]
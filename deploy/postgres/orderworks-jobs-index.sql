@@ -0,0 +1,13 @@
+-- Optional index for the StockWorks Orders tab when it reads jobs from the shared MakerWorks database.
+--
+-- StockWorks lists the newest jobs with
+--     ORDER BY makerworks_created_at DESC, created_at DESC, id DESC LIMIT :limit
+-- Without a matching index Postgres sorts the whole table on every request; with it the
+-- planner walks the index and stops after :limit rows. OrderWorks owns this table, so
+-- StockWorks never creates the index itself. Run once against the MakerWorks database:
+--
+--     psql "$DATABASE_URL" -f deploy/postgres/orderworks-jobs-index.sql
+--
+-- CONCURRENTLY keeps the table writable while the index builds (and must run outside a transaction).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_orderworks_jobs_sort
+    ON orderworks.jobs (makerworks_created_at DESC, created_at DESC, id DESC);
@@ -0,0 +1,28 @@
+"""Gunicorn settings for running StockWorks with multiple Uvicorn worker processes."""
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+keepalive = 5
+timeout = 30
+graceful_timeout = 30
+accesslog = "-"
+errorlog = "-"
+
+# The list/material caches in app.cache live inside each worker and are only invalidated
+# by the worker that handled the write, so they are disabled unless a single worker runs.
+if workers > 1:
+    os.environ.setdefault("STOCKWORKS_CACHE_TTL", "0")
+
+
+def on_starting(server):
+    """Create the schema once in the master so workers do not race each other on DDL."""
+    from app import models  # noqa: F401  (registers the tables on SQLModel.metadata)
+    from app.db import dispose_engine, init_db_schema
+
+    init_db_schema()
+    # Workers are forked from the master: drop its connections so each worker opens its own.
+    dispose_engine()
+    os.environ.setdefault("STOCKWORKS_RUN_MIGRATIONS", "0")